@@ -0,0 +1,250 @@
+# alt.py
+
+import mmap
+import random
+import struct
+import sys
+import heapq
+from array import array
+
+from edge_weighted_digraph import DijkstraSP
+
+# landmark file: a header, the landmarks (int32), then the distances from
+# and to each landmark (float64), each section starting on an 8-byte
+# boundary
+MAGIC = b'DSAL'
+VERSION = 1
+HEADER = struct.Struct('<4sHHIQ')
+BIG_ENDIAN = 1
+
+class Landmarks:
+    '''Distances from and to k landmark vertices of an edge-weighted
+    digraph, which by the triangle inequality give a lower bound on the
+    distance between any two vertices: for each landmark l,
+    d(v, t) >= d(v, l) - d(t, l) and d(v, t) >= d(l, t) - d(l, v).
+
+    Landmarks are chosen by the farthest method: the first is the vertex
+    farthest from a random start, and each next one the unchosen vertex
+    farthest from those already chosen, counting distances both from and
+    to them. If no unchosen vertex is connected to them either way, a
+    random one is taken. With method='random' they are distinct vertices
+    chosen at random. The tables are arrays of doubles, from_landmark[i][v] and
+    to_landmark[i][v], with inf for no path.'''
+    def __init__(self, g, k=16, method='farthest', seed=None):
+        if method not in ('farthest', 'random'):
+            raise ValueError(f'unknown method {method!r}')
+
+        rng = random.Random(seed)
+        rev = g.reverse()
+
+        self.V = g.V
+        self.landmarks = array('i')
+        self.from_landmark, self.to_landmark = list(), list()
+
+        if g.V == 0:
+            return
+
+        if method == 'random':
+            picks = rng.sample(range(g.V), min(k, g.V))
+
+        # distance from or to the nearest landmark chosen so far
+        nearest = DijkstraSP(g, rng.randrange(g.V)).dist
+        chosen = set()
+
+        for i in range(min(k, g.V)):
+            if method == 'random':
+                l = picks[i]
+            else:
+                l = self.farthest(nearest, chosen, rng)
+
+            chosen.add(l)
+            self.landmarks.append(l)
+            self.from_landmark.append(array('d', DijkstraSP(g, l).dist))
+            self.to_landmark.append(array('d', DijkstraSP(rev, l).dist))
+
+            if len(self.landmarks) == 1:
+                nearest = list(map(min, self.from_landmark[0], self.to_landmark[0]))
+            else:
+                nearest = list(map(min, nearest, self.from_landmark[-1], self.to_landmark[-1]))
+
+    def farthest(self, nearest, chosen, rng):
+        '''the unchosen vertex farthest from the landmarks, or a random
+        unchosen vertex if none is connected to them'''
+        candidates = [v for v in range(self.V) if v not in chosen and nearest[v] < float('inf')]
+
+        if candidates:
+            return max(candidates, key=nearest.__getitem__)
+
+        return rng.choice([v for v in range(self.V) if v not in chosen])
+
+    def lower_bound(self, v, t):
+        '''a lower bound on the distance from v to t'''
+        bound = 0
+
+        for to_l, from_l in zip(self.to_landmark, self.from_landmark):
+            # a NaN from inf - inf fails both comparisons
+            x = to_l[v] - to_l[t]
+            if x > bound:
+                bound = x
+
+            x = from_l[t] - from_l[v]
+            if x > bound:
+                bound = x
+
+        return bound
+
+    def nbytes(self):
+        return sum(a.itemsize * len(a) for a in
+                   [self.landmarks] + self.from_landmark + self.to_landmark)
+
+    def save(self, path):
+        '''writes the landmarks and their distance tables to path'''
+        k = len(self.landmarks)
+        flags = BIG_ENDIAN if sys.byteorder == 'big' else 0
+
+        with open(path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, flags, k, self.V))
+            f.write(bytes(-HEADER.size % 8))
+            f.write(self.landmarks)
+            f.write(bytes(-4 * k % 8))
+
+            for table in self.from_landmark + self.to_landmark:
+                f.write(table)
+
+    @classmethod
+    def load(cls, path):
+        '''Memory-maps landmarks written by save. The tables are read-only
+        views of the mapped file.'''
+        with open(path, 'rb') as f:
+            buf = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+        magic, version, flags, k, n = HEADER.unpack_from(buf)
+
+        if magic != MAGIC:
+            raise ValueError(f'{path} is not a landmark file')
+        if version != VERSION:
+            raise ValueError(f'{path} has unsupported version {version}')
+        if bool(flags & BIG_ENDIAN) != (sys.byteorder == 'big'):
+            raise ValueError(f'{path} was written with a different byte order')
+
+        start = HEADER.size + -HEADER.size % 8
+        tables = list()
+
+        self = cls.__new__(cls)
+        self.V = n
+        self.landmarks = buf[start:start + 4 * k].cast('i')
+        start += 4 * k + -4 * k % 8
+
+        for _ in range(2 * k):
+            tables.append(buf[start:start + 8 * n].cast('d'))
+            start += 8 * n
+
+        self.from_landmark, self.to_landmark = tables[:k], tables[k:]
+
+        return self
+
+
+class AStarSP:
+    '''A* search for a shortest path from s to t, for non-negative edge
+    weights: Dijkstra's algorithm with each vertex v keyed by its distance
+    from s plus lower_bound(v, t), so vertices leading away from t are
+    settled late or never. With the lower bounds of Landmarks (ALT) the
+    keys are consistent, so the search stops as soon as t is settled.
+    Without lower_bound it is Dijkstra's algorithm.
+
+    The queue is a heapq list with lazy deletion and only vertices that are
+    reached get a distance, so the work of a query does not depend on the
+    size of the digraph. settled counts the vertices settled.'''
+    def __init__(self, g, s, t, lower_bound=None, tracer=None):
+        self.s, self.t = s, t
+        self.dist = {s: 0}
+        self.edge_to = dict()
+        self.settled = 0
+        self.tracer = tracer
+
+        self.search(g, s, t, lower_bound)
+
+    def search(self, g, s, t, lower_bound):
+        dist, edge_to = self.dist, self.edge_to
+        heap = [(0, s)]
+        marked = set()
+        bound = dict()
+
+        while heap:
+            _, v = heapq.heappop(heap)
+
+            # an entry left behind when v was reached by a shorter path
+            if v in marked:
+                continue
+
+            marked.add(v)
+            self.settled += 1
+
+            if self.tracer is not None:
+                self.tracer.vertex_visited(v)
+
+            if v == t:
+                return
+
+            for e in g.adj[v]:
+                w, d = e.tl, dist[v] + e.wt
+
+                if self.tracer is not None:
+                    self.tracer.edge_examined(v, w)
+
+                if w in marked or d >= dist.get(w, float('inf')):
+                    continue
+
+                if lower_bound is not None and w not in bound:
+                    bound[w] = lower_bound(w, t)
+
+                # t cannot be reached from w
+                if bound.get(w, 0) == float('inf'):
+                    continue
+
+                if self.tracer is not None:
+                    self.tracer.edge_relaxed(e)
+
+                dist[w] = d
+                edge_to[w] = e
+                heapq.heappush(heap, (d + bound.get(w, 0), w))
+
+    def has_path(self):
+        return self.t in self.dist
+
+    def distance(self):
+        return self.dist.get(self.t, float('inf'))
+
+    def path(self):
+        '''the edges of a shortest path from s to t, or None'''
+        if not self.has_path():
+            return None
+
+        path, v = list(), self.t
+
+        while v != self.s:
+            path.append(self.edge_to[v])
+            v = self.edge_to[v].head()
+
+        path.reverse()
+
+        return path
+
+
+class ALT:
+    '''Point-to-point shortest paths by A* with landmark lower bounds, for
+    a digraph queried many times. The landmarks are computed once (or
+    loaded from a file written by save) and shared by every query.'''
+    def __init__(self, g, landmarks=None, k=16, method='farthest', seed=None):
+        self.g = g
+        self.landmarks = landmarks if landmarks is not None else Landmarks(g, k, method, seed)
+
+    @classmethod
+    def load(cls, g, path):
+        return cls(g, Landmarks.load(path))
+
+    def save(self, path):
+        self.landmarks.save(path)
+
+    def query(self, s, t, tracer=None):
+        return AStarSP(self.g, s, t, self.landmarks.lower_bound, tracer)
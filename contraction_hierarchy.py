@@ -0,0 +1,285 @@
+# contraction_hierarchy.py
+
+import heapq
+import time
+from array import array
+
+from csr import CSR
+from edge_weighted_digraph import Edge
+from priority_queue import IndexMinPriorityQueue
+
+# most vertices a witness search settles before giving up and adding the
+# shortcut anyway; a lower limit preprocesses faster but adds shortcuts
+# that are not needed
+SETTLE_LIMIT = 60
+
+class ContractionHierarchy:
+    '''Contraction hierarchy of a static edge-weighted digraph with
+    non-negative weights, for fast point-to-point queries.
+
+    Vertices are contracted one at a time in order of edge difference (the
+    shortcuts contracting a vertex would add, less the edges it would
+    remove, plus the number of its neighbours already contracted), with
+    priorities updated lazily. Contracting v adds a shortcut u->w for each
+    path u->v->w that is the only shortest path, as far as a witness search
+    from u that avoids v can tell.
+
+    Every edge and shortcut is kept, in CSR form, at its lower-ranked end:
+    up holds the edges v->w to higher-ranked w, and down the edges u->v
+    from higher-ranked u, listed at v. up_middle and down_middle hold the
+    vertex each shortcut bypasses, or -1 for an edge of g. Queries search
+    upwards from both ends, so only a small part of the hierarchy is seen.
+
+    preprocessing_time is the time taken to build the hierarchy in seconds
+    and shortcuts the number of shortcuts added.'''
+    def __init__(self, g, settle_limit=SETTLE_LIMIT):
+        start = time.perf_counter()
+
+        self.V = g.V
+        self.settle_limit = settle_limit
+        self.rank = array('i', [0]) * g.V
+
+        # the graph still to be contracted: out[v][w] and into[w][v] are
+        # the weight and middle vertex of the lightest edge v->w
+        out = [dict() for _ in range(g.V)]
+        into = [dict() for _ in range(g.V)]
+
+        for e in g.edges():
+            v, w, x = e.head(), e.tail(), e.weight()
+
+            if v != w and (w not in out[v] or x < out[v][w][0]):
+                out[v][w] = into[w][v] = (x, -1)
+
+        up, down = [None] * g.V, [None] * g.V
+        deleted = [0] * g.V
+        pq = IndexMinPriorityQueue(g.V)
+
+        for v in range(g.V):
+            pq.insert(v, self.edge_difference(out, into, v, deleted, self.find_shortcuts(out, into, v)))
+
+        rank = 0
+
+        while not pq.empty():
+            v = pq.remove_min()
+            shortcuts = self.find_shortcuts(out, into, v)
+            priority = self.edge_difference(out, into, v, deleted, shortcuts)
+
+            if not pq.empty() and priority > pq.min_key():
+                pq.insert(v, priority)
+                continue
+
+            up[v], down[v] = list(out[v].items()), list(into[v].items())
+
+            for w in out[v]:
+                del into[w][v]
+                deleted[w] += 1
+            for u in into[v]:
+                del out[u][v]
+                deleted[u] += 1
+
+            for u, w, x in shortcuts:
+                if w not in out[u] or x < out[u][w][0]:
+                    out[u][w] = into[w][u] = (x, v)
+
+            out[v] = into[v] = None
+            self.rank[v] = rank
+            rank += 1
+
+        self.up, self.up_middle = self.compress(up)
+        self.down, self.down_middle = self.compress(down)
+
+        # a lighter shortcut for u->w replaces the one before it, so the
+        # shortcuts are counted once the hierarchy is built
+        self.shortcuts = sum(m != -1 for m in self.up_middle) + sum(m != -1 for m in self.down_middle)
+
+        self.preprocessing_time = time.perf_counter() - start
+
+    def find_shortcuts(self, out, into, v):
+        '''the shortcuts (u, w, weight) needed to contract v'''
+        shortcuts = list()
+
+        for u, (x, _) in into[v].items():
+            through = {w: x + y for w, (y, _) in out[v].items() if w != u}
+
+            if not through:
+                continue
+
+            dist = self.witness_search(out, u, v, max(through.values()))
+
+            for w, d in through.items():
+                if dist.get(w, float('inf')) > d:
+                    shortcuts.append((u, w, d))
+
+        return shortcuts
+
+    def witness_search(self, out, s, avoid, limit):
+        '''Dijkstra's algorithm from s in the uncontracted graph without
+        avoid, stopping at distance limit or after settle_limit vertices.
+        Returns the distances found, which are upper bounds.'''
+        dist = {s: 0}
+        heap = [(0, s)]
+        settled = 0
+
+        while heap and settled < self.settle_limit:
+            d, v = heapq.heappop(heap)
+
+            if d > dist[v]:
+                continue
+            if d > limit:
+                break
+
+            settled += 1
+
+            for w, (x, _) in out[v].items():
+                if w != avoid and d + x < dist.get(w, float('inf')):
+                    dist[w] = d + x
+                    heapq.heappush(heap, (d + x, w))
+
+        return dist
+
+    def edge_difference(self, out, into, v, deleted, shortcuts):
+        return len(shortcuts) - len(out[v]) - len(into[v]) + deleted[v]
+
+    def compress(self, adj):
+        '''CSR of (vertex, (weight, middle)) lists, and the middles'''
+        offsets = array('q', bytes(8 * (self.V + 1)))
+        targets, weights, middles = array('i'), array('d'), array('i')
+
+        for v, edges in enumerate(adj):
+            for w, (x, m) in edges:
+                targets.append(w)
+                weights.append(x)
+                middles.append(m)
+
+            offsets[v + 1] = len(targets)
+
+        return CSR(offsets, targets, weights), middles
+
+    def nbytes(self):
+        return (self.up.nbytes() + self.down.nbytes() + self.rank.itemsize * self.V +
+                self.up_middle.itemsize * (len(self.up_middle) + len(self.down_middle)))
+
+    def find(self, csr, middles, v, w):
+        '''the weight and middle of the entry w at v'''
+        for i in range(csr.offsets[v], csr.offsets[v + 1]):
+            if csr.targets[i] == w:
+                return csr.weights[i], middles[i]
+
+    def unpack(self, edges):
+        '''Expands shortcuts (u, w, weight, middle) into the edges of g they
+        stand for, as a list of Edge objects.'''
+        path, stack = list(), list(reversed(edges))
+
+        while stack:
+            u, w, x, m = stack.pop()
+
+            if m == -1:
+                path.append(Edge(u, w, x))
+                continue
+
+            # both ends of a shortcut rank above the vertex it bypasses
+            stack.append((m, w) + self.find(self.up, self.up_middle, m, w))
+            stack.append((u, m) + self.find(self.down, self.down_middle, m, u))
+
+        return path
+
+    def query(self, s, t):
+        return HierarchySP(self, s, t)
+
+
+class HierarchySP:
+    '''Shortest path from s to t in a contraction hierarchy: Dijkstra's
+    algorithm upwards from s in up and from t in down, the side with the
+    nearer vertex going next, until neither side has a vertex nearer than
+    the best path through a vertex both have settled. The queues are heapq
+    lists and distances are held in dicts, so a query costs nothing in
+    proportion to V. settled counts the vertices settled and query_time
+    is the time taken by the search in seconds, not counting path().'''
+    def __init__(self, ch, s, t):
+        start = time.perf_counter()
+
+        self.ch, self.s, self.t = ch, s, t
+        self.best, self.meet = float('inf'), None
+        self.settled = 0
+
+        # parent[v] is (parent, weight, middle) of the edge v was reached by
+        self.forward, self.backward = {s: 0}, {t: 0}
+        self.forward_parent, self.backward_parent = dict(), dict()
+
+        self.search()
+
+        self.query_time = time.perf_counter() - start
+
+    def search(self):
+        ch = self.ch
+        forward = (self.forward, self.forward_parent, [(0, self.s)],
+                   ch.up, ch.up_middle, ch.down, self.backward)
+        backward = (self.backward, self.backward_parent, [(0, self.t)],
+                    ch.down, ch.down_middle, ch.up, self.forward)
+        forward_heap, backward_heap = forward[2], backward[2]
+
+        while True:
+            forward_top = forward_heap[0][0] if forward_heap else float('inf')
+            backward_top = backward_heap[0][0] if backward_heap else float('inf')
+
+            if min(forward_top, backward_top) >= self.best:
+                return
+
+            self.settle(*(forward if forward_top <= backward_top else backward))
+
+    def settle(self, dist, parent, heap, csr, middles, stall, other):
+        '''Settles the nearest vertex v of one side. Stall-on-demand: if an
+        edge into v from a higher-ranked vertex already seen gives v a
+        shorter distance than the one it was reached with, no shortest path
+        goes upwards through v, so its edges are not relaxed.'''
+        d, v = heapq.heappop(heap)
+
+        if d > dist[v]:
+            return
+
+        self.settled += 1
+
+        if v in other and d + other[v] < self.best:
+            self.best, self.meet = d + other[v], v
+
+        for i in range(stall.offsets[v], stall.offsets[v + 1]):
+            if dist.get(stall.targets[i], float('inf')) + stall.weights[i] < d:
+                return
+
+        offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+
+        for i in range(offsets[v], offsets[v + 1]):
+            w, x = targets[i], d + weights[i]
+
+            if x < dist.get(w, float('inf')):
+                dist[w] = x
+                parent[w] = (v, weights[i], middles[i])
+                heapq.heappush(heap, (x, w))
+
+    def has_path(self):
+        return self.meet is not None
+
+    def distance(self):
+        return self.best
+
+    def path(self):
+        '''the edges of g on a shortest path from s to t, or None'''
+        if not self.has_path():
+            return None
+
+        shortcuts, v = list(), self.meet
+
+        while v != self.s:
+            u, x, m = self.forward_parent[v]
+            shortcuts.append((u, v, x, m))
+            v = u
+
+        shortcuts.reverse()
+        v = self.meet
+
+        while v != self.t:
+            w, x, m = self.backward_parent[v]
+            shortcuts.append((v, w, x, m))
+            v = w
+
+        return self.ch.unpack(shortcuts)
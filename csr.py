@@ -0,0 +1,119 @@
+# csr.py
+
+from array import array
+from itertools import accumulate, chain, repeat
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+class CSR:
+    '''Compressed sparse row adjacency: the neighbours of v are
+    targets[offsets[v]:offsets[v + 1]], and for an edge-weighted graph
+    weights holds the weight of each entry of targets.'''
+    def __init__(self, offsets, targets, weights=None):
+        self.offsets = memoryview(offsets)
+        self.targets = memoryview(targets)
+        self.weights = memoryview(weights) if weights is not None else None
+
+    @classmethod
+    def from_lists(cls, adj):
+        '''builds a CSR from a list of adjacency lists'''
+        offsets = array('q', bytes(8 * (len(adj) + 1)))
+        targets = array('i')
+
+        for v, neighbours in enumerate(adj):
+            targets.extend(neighbours)
+            offsets[v + 1] = len(targets)
+
+        return cls(offsets, targets)
+
+    @classmethod
+    def from_pairs(cls, n, sources, targets, weights=None):
+        '''Builds a CSR with an edge from sources[i] to targets[i] (of weight
+        weights[i]) for each i by counting sort, keeping the order of each
+        vertex's edges. The columns may be sequences or NumPy arrays.'''
+        if np is not None and isinstance(sources, np.ndarray):
+            offsets = np.zeros(n + 1, dtype=np.int64)
+            np.cumsum(np.bincount(sources, minlength=n), out=offsets[1:])
+            order = np.argsort(sources, kind='stable')
+            targets = np.ascontiguousarray(targets[order], dtype=np.int32)
+
+            if weights is not None:
+                weights = np.ascontiguousarray(weights[order], dtype=np.float64)
+
+            return cls(offsets, targets, weights)
+
+        # plain lists are faster to index than arrays while sorting
+        degree = [0] * (n + 1)
+
+        for v in sources:
+            degree[v + 1] += 1
+
+        offsets = list(accumulate(degree))
+        pos = offsets[:-1]
+        order = [0] * len(sources)
+
+        for i, v in enumerate(sources):
+            order[pos[v]] = i
+            pos[v] += 1
+
+        sorted_targets = array('i', map(targets.__getitem__, order))
+
+        if weights is not None:
+            weights = array('d', map(weights.__getitem__, order))
+
+        return cls(array('q', offsets), sorted_targets, weights)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, v):
+        return self.targets[self.offsets[v]:self.offsets[v + 1]]
+
+    def __iter__(self):
+        for v in range(len(self)):
+            yield self[v]
+
+    def degree(self, v):
+        return self.offsets[v + 1] - self.offsets[v]
+
+    def transpose(self):
+        '''returns the CSR of the reversed edges, built by counting sort'''
+        if np is not None:
+            offsets = np.asarray(self.offsets)
+            sources = np.repeat(np.arange(len(self), dtype=np.int32), np.diff(offsets))
+            weights = np.asarray(self.weights) if self.weights is not None else None
+
+            return CSR.from_pairs(len(self), np.asarray(self.targets), sources, weights)
+
+        offsets = self.offsets.tolist()
+        sources = list(chain.from_iterable(
+            repeat(v, offsets[v + 1] - offsets[v]) for v in range(len(self))))
+        weights = self.weights.tolist() if self.weights is not None else None
+
+        return CSR.from_pairs(len(self), self.targets.tolist(), sources, weights)
+
+    def nbytes(self):
+        nbytes = self.offsets.nbytes + self.targets.nbytes
+
+        if self.weights is not None:
+            nbytes += self.weights.nbytes
+
+        return nbytes
+
+    def __reduce__(self):
+        columns = [self.offsets, self.targets]
+
+        if self.weights is not None:
+            columns.append(self.weights)
+
+        copies = list()
+
+        for column in columns:
+            copy = array(column.format)
+            copy.frombytes(column.tobytes())
+            copies.append(copy)
+
+        return (CSR, tuple(copies))
@@ -1,70 +1,165 @@
 # digraph.py
 
-class Digraph:
+import random
+import sys
+import time
+from array import array
+
+import graph_io
+from csr import CSR
+from shared_graph import FreezableStorage, FrozenStorage
+from traversal import bidirectional_bfs, breadth_first, depth_first
+
+class Digraph(FreezableStorage):
     def __init__(self, n):
         self.V = n
         self.M = 0
         self.adj = [list() for _ in range(n)]
+        self.rev = None
+
+    @classmethod
+    def from_edges(cls, n, edges):
+        '''builds a digraph from (v, w) pairs or an (N, 2) NumPy array'''
+        g = cls(n)
+        g.add_edges(*graph_io.edge_columns(edges, 2, n))
+        return g
+
+    @classmethod
+    def from_lines(cls, lines):
+        '''builds a digraph from the lines of a tinyDG-format edge list'''
+        n, columns = graph_io.read_edge_list(lines)
+        g = cls(n)
+        g.add_edges(*columns)
+        return g
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path) as f:
+            return cls.from_lines(f)
 
     def add_edge(self, v, w):
         self.adj[v].append(w)
         self.M += 1
+        self.rev = None
+
+    def add_edges(self, vs, ws):
+        '''adds an edge from vs[i] to ws[i] for each i'''
+        adj = self.adj
+
+        for v, w in zip(vs, ws):
+            adj[v].append(w)
+
+        self.M += len(vs)
+        self.rev = None
+
+    def reverse(self):
+        '''Returns the digraph with its edges reversed, as a FrozenDigraph
+        built by counting sort. It is cached until an edge is added, so
+        repeated calls cost nothing; edges added by changing adj directly
+        are not seen. The copy is a snapshot: its own reverse is a frozen
+        copy of this digraph as it was, not this digraph.'''
+        if self.rev is None:
+            self.rev = FrozenDigraph(CSR.from_lists(self.adj).transpose(), self.M)
+
+        return self.rev
+
+    def in_degree(self, v):
+        return self.reverse().adj.degree(v)
+
+    def predecessors(self, v):
+        '''the vertices with an edge to v'''
+        return self.reverse().adj[v]
+
+    def freeze(self):
+        '''returns a read-only copy of the digraph in compressed sparse row form'''
+        return FrozenDigraph(CSR.from_lists(self.adj), self.M)
+
+
+class FrozenDigraph(FrozenStorage):
+    kind = 'digraph'
+
+    def __init__(self, csr, m):
+        self.V = len(csr)
+        self.M = m
+        self.adj = csr
+        self.rev = None
+
+    def parts(self):
+        return self.adj, self.M
+
+    @classmethod
+    def from_edges(cls, n, edges):
+        '''builds a frozen digraph directly from (v, w) pairs or an (N, 2)
+        NumPy array, without building adjacency lists first'''
+        if graph_io.np is not None and isinstance(edges, graph_io.np.ndarray):
+            vs, ws = graph_io.vertex_columns(edges, n)
+        else:
+            vs, ws = graph_io.edge_columns(edges, 2)
+
+        return cls(CSR.from_pairs(n, vs, ws), len(vs))
 
     def reverse(self):
-        rev = Digraph(self.V)
+        '''the digraph with its edges reversed, computed once'''
+        if self.rev is None:
+            self.rev = FrozenDigraph(self.adj.transpose(), self.M)
+            self.rev.rev = self
+
+        return self.rev
 
-        for v in range(self.V):
-            for w in self.adj[v]:
-                rev.add_edge(w, v)
+    def in_degree(self, v):
+        return self.reverse().adj.degree(v)
 
-        return rev
+    def predecessors(self, v):
+        '''the vertices with an edge to v'''
+        return self.reverse().adj[v]
 
 class DirectedDFS:
-    def __init__(self, g, source):
+    def __init__(self, g, source, tracer=None):
         self.marked = [False for _ in range(g.V)]
+        self.tracer = tracer
 
+        # source is a vertex or an iterable of vertices
         try:
-            for s in source:
-                self.dfs(g, s)
-        except:
-            self.dfs(g, source)
+            sources = list(source)
+        except TypeError:
+            sources = [source]
 
-    def dfs(self, g, v):
-        self.marked[v] = True
+        for s in sources:
+            self.dfs(g, s)
 
-        for w in g.adj[v]:
-            if not self.is_marked(w):
-                self.dfs(g, w)
+    def dfs(self, g, v):
+        depth_first(g, v, self.marked, tracer=self.tracer)
 
     def is_marked(self, v):
         return self.marked[v]
 
 
 class DirectedBFS:
-    def __init__(self, g, source):
+    def __init__(self, g, source, tracer=None):
         self.marked = [False for _ in range(g.V)]
+        self.edge_to = [-1 for _ in range(g.V)]
+        self.dist = [-1 for _ in range(g.V)]
+        self.tracer = tracer
 
+        # source is a vertex or an iterable of vertices
         try:
-            for s in source:
-                self.bfs(g, s)
-        except:
-            self.bfs(g, source)
+            sources = list(source)
+        except TypeError:
+            sources = [source]
 
-    def bfs(self,  g, s):
-        to_visit = [s]
-        self.marked[s] = True
+        self.bfs(g, sources)
 
-        while to_visit:
-            curr = to_visit.pop(0)
-
-            for v in g.adj[curr]:
-                if not self.is_marked(v):
-                    self.marked[v] = True
-                    to_visit.append(v)
+    def bfs(self, g, sources):
+        breadth_first(g, sources, self.marked, self.edge_to, self.dist,
+                      g.reverse, self.tracer)
 
     def is_marked(self, v):
         return self.marked[v]
 
+    def dist_to(self, v):
+        '''number of edges on a shortest path from the nearest source to v'''
+        return self.dist[v]
+
     def reachable(self):
         t = list()
 
@@ -75,21 +170,17 @@ class DirectedBFS:
         return t
 
 class DirectedPathDFS():
-    def __init__(self, g, s):
+    def __init__(self, g, s, tracer=None):
         self.source = s
         self.marked = [False for _ in range(g.V)]
         self.edge_to = [-1 for _ in range(g.V)]
         self.count = 0
+        self.tracer = tracer
         self.dfs(g, s)
 
     def dfs(self, g, v):
-        self.marked[v] = True
-        self.count += 1
-        
-        for w in g.adj[v]:
-            if not self.marked[w]:
-                self.edge_to[w] = v
-                self.dfs(g, w)
+        depth_first(g, v, self.marked, self.edge_to, tracer=self.tracer)
+        self.count = sum(self.marked)
 
     def has_path_to(self, v):
         return self.marked[v]
@@ -107,28 +198,25 @@ class DirectedPathDFS():
 
 
 class DirectedPathBFS:
-    def __init__(self, g, s):
+    def __init__(self, g, s, tracer=None):
         self.marked = [False for _ in range(g.V)]
         self.edge_to = [-1 for _ in range(g.V)]
+        self.dist = [-1 for _ in range(g.V)]
         self.source = s
+        self.tracer = tracer
         self.bfs(g)
 
     def bfs(self, g):
-        self.marked[self.source] = True
-        to_visit = [self.source]
-
-        while to_visit:
-            curr = to_visit.pop(0)
-
-            for w in g.adj[curr]:
-                if not self.marked[w]:
-                    to_visit.append(w)
-                    self.marked[w] = True
-                    self.edge_to[w] = curr
+        breadth_first(g, [self.source], self.marked, self.edge_to, self.dist,
+                      g.reverse, self.tracer)
 
     def has_path_to(self, v):
         return self.marked[v]
 
+    def dist_to(self, v):
+        '''number of edges on a shortest path to v, -1 if there is none'''
+        return self.dist[v]
+
     def shortest_path_to(self, v):
         path = [v]
 
@@ -141,66 +229,464 @@ class DirectedPathBFS:
         return path
 
 
+class DirectedBidirectionalPathBFS:
+    '''Shortest directed path from s to t, found by searching forward from
+    s and backward from t at once; only visits the vertices near s and t.
+    rev is g.reverse(), which may be passed in when making many queries.'''
+    def __init__(self, g, s, t, rev=None, tracer=None):
+        if rev is None:
+            rev = g.reverse()
+
+        self.source, self.target = s, t
+        self.path, self.count = bidirectional_bfs(g, rev, s, t, tracer)
+
+    def has_path(self):
+        return self.path is not None
+
+    def dist(self):
+        '''number of edges on a shortest path, -1 if there is none'''
+        return len(self.path) - 1 if self.path is not None else -1
+
+    def shortest_path(self):
+        return self.path
+
+
 class DirectedCycle:
-    def __init__(self, g):
+    def __init__(self, g, tracer=None):
         self.on_path = [False for _ in range(g.V)]
         self.edge_to = [-1 for _ in range(g.V)]
         self.marked = [False for _ in range(g.V)]
         self.cycle = None
+        self.tracer = tracer
 
         for v in range(g.V):
-            if not marked[v]:
+            if self.cycle is None and not self.marked[v]:
                 self.dfs(g, v)
 
-    def dfs(g, v):
-        self.marked[v] = True
+    def dfs(self, g, v):
+        depth_first(g, v, self.marked, self.edge_to, pre=self.enter,
+                    post=self.leave, non_tree_edge=self.check,
+                    tracer=self.tracer)
+
+    def enter(self, v):
         self.on_path[v] = True
 
-        for w in g.adj[v]:
-            if self.cycle:
-                return
-            elif not marked[w]:
-                self.edge_to[w] = v
-                self.dfs(w)
-            elif self.on_path[w]:
-                self.has_cycle = True
-                self.cycle = [w]
-
-                x = v
-                while x != w:
-                    self.cycle.append(x)
-                    x = self.edge_to[x]
-
-                self.cycle.append(w)
-                self.cycle.reverse()
+    def leave(self, v):
+        self.on_path[v] = False
+
+    def check(self, v, w):
+        if self.cycle is None and self.on_path[w]:
+            self.cycle = [w]
+
+            x = v
+            while x != w:
+                self.cycle.append(x)
+                x = self.edge_to[x]
+
+            self.cycle.append(w)
+            self.cycle.reverse()
 
     def has_cycle(self):
         return self.cycle is not None
 
 
 class DepthFirstOrder:
-    def __init__(self, g):
+    def __init__(self, g, tracer=None):
         self.marked = [False for _ in range(g.V)]
         self.pre = list()
         self.post = list()
+        self.tracer = tracer
 
         for v in range(g.V):
             if not self.marked[v]:
                 self.dfs(g, v)
 
     def dfs(self, g, v):
-        self.marked[v] = True
+        depth_first(g, v, self.marked, pre=self.pre.append,
+                    post=self.post.append, tracer=self.tracer)
+
+    def reverse_post(self):
+        return reversed(self.post)
 
-        self.pre.append(v)
 
+def topological_levels(g, edge_to=None):
+    '''Kahn's algorithm, a level at a time: yields the vertices of g with no
+    incoming edges, then the vertices whose incoming edges all come from
+    earlier levels, and so on. The vertices of a level do not depend on
+    each other, so each level can be run concurrently as soon as it is
+    yielded. Vertices on or after a cycle are never yielded. If edge_to is
+    given, edge_to[w] is set to a vertex of the previous level with an edge
+    to w.'''
+    indegree = [0 for _ in range(g.V)]
+
+    for v in range(g.V):
         for w in g.adj[v]:
-            if not self.marked[w]:
-                self.dfs(g, w)
+            indegree[w] += 1
 
-        self.post.append(v)
+    level = [v for v in range(g.V) if indegree[v] == 0]
 
-    def reverse_post(self):
-        return reversed(self.post)
+    while level:
+        yield level
+
+        next_level = list()
+
+        for v in level:
+            for w in g.adj[v]:
+                indegree[w] -= 1
+
+                if indegree[w] == 0:
+                    next_level.append(w)
+
+                    if edge_to is not None:
+                        edge_to[w] = v
+
+        level = next_level
+
+
+class Topological:
+    '''Topological order of a DAG by Kahn's algorithm, grouped into levels
+    that can be scheduled concurrently. If g has a cycle there is no order
+    and cycle holds one of its cycles.'''
+    def __init__(self, g):
+        self.edge_to = [-1 for _ in range(g.V)]
+        self.levels = list(topological_levels(g, self.edge_to))
+        self.cycle = None
+
+        if sum(map(len, self.levels)) < g.V:
+            self.levels = None
+            self.cycle = DirectedCycle(g).cycle
+
+    def has_order(self):
+        return self.levels is not None
+
+    def order(self):
+        if self.has_order():
+            for level in self.levels:
+                yield from level
+
+    def critical_path_length(self):
+        '''number of vertices on a longest path, which is the number of
+        levels'''
+        return len(self.levels) if self.has_order() else -1
+
+    def critical_path(self):
+        '''a longest path through the DAG'''
+        if not self.has_order() or not self.levels:
+            return None
+
+        path = [self.levels[-1][0]]
+
+        while self.edge_to[path[-1]] != -1:
+            path.append(self.edge_to[path[-1]])
+
+        path.reverse()
+
+        return path
+
+
+class CycleError(ValueError):
+    '''raised instead of adding an edge that would close a cycle, which is
+    held in cycle as a list of vertices starting and ending at the same one'''
+    def __init__(self, cycle):
+        super().__init__('edge would close the cycle ' + '->'.join(map(str, cycle)))
+        self.cycle = cycle
+
+
+class AcyclicDigraph(Digraph):
+    '''Digraph that stays acyclic: add_edge raises CycleError, leaving the
+    digraph unchanged, instead of adding an edge that would close a cycle.
+
+    A topological order is kept up to date as edges are added (Pearce-Kelly):
+    ord[v] is the position of v in the order. An edge v->w with v already
+    before w costs O(1). Otherwise only the vertices placed between w and v
+    are searched, and only those found to be affected are reordered.'''
+    def __init__(self, n):
+        super().__init__(n)
+        self.pred = [list() for _ in range(n)]
+        self.ord = list(range(n))
+        self.pos = list(range(n))
+
+    def add_edge(self, v, w):
+        if self.ord[w] <= self.ord[v]:
+            self.reorder(v, w)
+
+        super().add_edge(v, w)
+        self.pred[w].append(v)
+
+    def add_edges(self, vs, ws):
+        '''adds an edge from vs[i] to ws[i] for each i, stopping at the first
+        that would close a cycle'''
+        for v, w in zip(vs, ws):
+            self.add_edge(v, w)
+
+    def reorder(self, v, w):
+        '''Moves the vertices reachable from w ahead of the vertices that
+        reach v, using only the positions they already occupy, so that v
+        comes before w. Raises CycleError if v is reachable from w.'''
+        ord = self.ord
+        lower, upper = ord[w], ord[v]
+
+        if v == w:
+            raise CycleError([v, v])
+
+        # vertices reachable from w that are placed before v
+        edge_to = {w: w}
+        forward, stack = [w], [w]
+
+        while stack:
+            x = stack.pop()
+
+            for y in self.adj[x]:
+                if y == v:
+                    path = [x]
+                    while path[-1] != w:
+                        path.append(edge_to[path[-1]])
+                    path.reverse()
+
+                    raise CycleError([v] + path + [v])
+
+                if ord[y] < upper and y not in edge_to:
+                    edge_to[y] = x
+                    forward.append(y)
+                    stack.append(y)
+
+        # vertices that reach v and are placed after w
+        seen = {v}
+        backward, stack = [v], [v]
+
+        while stack:
+            for x in self.pred[stack.pop()]:
+                if ord[x] > lower and x not in seen:
+                    seen.add(x)
+                    backward.append(x)
+                    stack.append(x)
+
+        backward.sort(key=ord.__getitem__)
+        forward.sort(key=ord.__getitem__)
+        vertices = backward + forward
+
+        for x, i in zip(vertices, sorted(ord[x] for x in vertices)):
+            ord[x] = i
+            self.pos[i] = x
+
+    def order(self):
+        '''the vertices in the current topological order'''
+        return list(self.pos)
+
+
+class KosarajuSharirSCC:
+    '''Strongly connected components, found by depth-first searches of g
+    started in the reverse postorder of g.reverse(). id[v] is the component
+    of v, and every edge between two components goes from the higher id to
+    the lower, so decreasing id order is a topological order of the
+    condensation.'''
+    def __init__(self, g, tracer=None):
+        self.marked = [False for _ in range(g.V)]
+        self.id = array('i', bytes(4 * g.V))
+        self.count = 0
+        self.tracer = tracer
+
+        for s in DepthFirstOrder(g.reverse()).reverse_post():
+            if not self.marked[s]:
+                self.dfs(g, s)
+                self.count += 1
+
+    def dfs(self, g, v):
+        depth_first(g, v, self.marked, pre=self.visit, tracer=self.tracer)
+
+    def visit(self, v):
+        self.id[v] = self.count
+
+    def strongly_connected(self, v, w):
+        return self.id[v] == self.id[w]
+
+    def components(self):
+        '''CSR listing the vertices of each component'''
+        return CSR.from_pairs(self.count, self.id, range(len(self.id)))
+
+    def condensation(self, g):
+        '''Returns the DAG with a vertex for each component of g and one edge
+        from component c to component d if any edge of g goes from c to d.'''
+        dag = Digraph(self.count)
+        last_source = [-1 for _ in range(self.count)]
+
+        for c, members in enumerate(self.components()):
+            for v in members:
+                for w in g.adj[v]:
+                    d = self.id[w]
+
+                    if d != c and last_source[d] != c:
+                        last_source[d] = c
+                        dag.add_edge(c, d)
+
+        return dag
+
+
+class MultiSourceReachability:
+    '''Reachability from many sources at once. Each vertex gets a bitset
+    (a Python int) in which bit i is set if sources[i] reaches it. The
+    bitsets are propagated along the condensation of g in topological
+    order, so one sweep over the graph answers every source.'''
+    def __init__(self, g, sources, scc=None):
+        if scc is None:
+            scc = KosarajuSharirSCC(g)
+
+        self.sources = list(sources)
+        self.id = scc.id
+        self.masks = [0 for _ in range(scc.count)]
+
+        for i, s in enumerate(self.sources):
+            self.masks[scc.id[s]] |= 1 << i
+
+        # edges of the condensation go from higher ids to lower ones
+        dag = scc.condensation(g)
+
+        for c in range(scc.count - 1, -1, -1):
+            mask = self.masks[c]
+
+            if mask:
+                for d in dag.adj[c]:
+                    self.masks[d] |= mask
+
+    def mask(self, v):
+        '''bitset of the sources that reach v'''
+        return self.masks[self.id[v]]
+
+    def reaches(self, i, v):
+        '''checks if sources[i] reaches v'''
+        return self.mask(v) >> i & 1 == 1
+
+    def sources_reaching(self, v):
+        mask = self.mask(v)
+        return [s for i, s in enumerate(self.sources) if mask >> i & 1]
+
+    def reachable(self, i):
+        '''vertices reached from sources[i]'''
+        bit = 1 << i
+        return [v for v in range(len(self.id)) if self.masks[self.id[v]] & bit]
+
+
+class ReachabilityIndex:
+    '''Index over the condensation of a mostly static digraph, built once
+    to answer "can u reach v" without a traversal per query. Two methods
+    are available:
+
+    - 'closure': the transitive closure of the condensation as one bitset
+      per component. Queries take O(1), but memory can grow as the square
+      of the number of components.
+    - 'intervals': k random depth-first interval labels per component
+      (GRAIL). A query is refuted in O(k) unless every label contains the
+      target's. Otherwise a depth-first search of the condensation decides
+      it, pruned by the labels. Memory is O(k) per component.
+
+    build_time is the time taken to build the index in seconds, and
+    memory() its size in bytes.'''
+    def __init__(self, g, method='closure', k=3, scc=None, seed=None):
+        start = time.perf_counter()
+
+        if scc is None:
+            scc = KosarajuSharirSCC(g)
+
+        self.id = scc.id
+        self.method = method
+        dag = scc.condensation(g)
+
+        if method == 'closure':
+            self.closure = [0 for _ in range(scc.count)]
+
+            # components only have edges to lower ids, which come first
+            for c in range(scc.count):
+                reach = 1 << c
+
+                for d in dag.adj[c]:
+                    reach |= self.closure[d]
+
+                self.closure[c] = reach
+        elif method == 'intervals':
+            self.dag = dag.freeze()
+            self.lows, self.posts = list(), list()
+            rng = random.Random(seed)
+
+            for _ in range(k):
+                for neighbours in dag.adj:
+                    rng.shuffle(neighbours)
+
+                roots = list(range(scc.count))
+                rng.shuffle(roots)
+
+                self.label(dag, roots)
+        else:
+            raise ValueError(f'unknown method {method!r}')
+
+        self.build_time = time.perf_counter() - start
+
+    def label(self, dag, roots):
+        '''Adds one interval label per component from a DFS started at the
+        roots in the given order: posts[c] is the postorder rank of c, and
+        lows[c] the lowest rank of any component c reaches.'''
+        posts, lows = array('i', bytes(4 * dag.V)), array('i', bytes(4 * dag.V))
+        marked = [False for _ in range(dag.V)]
+        rank = 0
+
+        def finish(c):
+            nonlocal rank
+            low = rank
+
+            for d in dag.adj[c]:
+                if lows[d] < low:
+                    low = lows[d]
+
+            posts[c], lows[c] = rank, low
+            rank += 1
+
+        for c in roots:
+            if not marked[c]:
+                depth_first(dag, c, marked, post=finish)
+
+        self.posts.append(posts)
+        self.lows.append(lows)
+
+    def contains(self, c, d):
+        '''checks if every label of c contains the label of d'''
+        for lows, posts in zip(self.lows, self.posts):
+            if lows[d] < lows[c] or posts[d] > posts[c]:
+                return False
+        return True
+
+    def reachable(self, u, v):
+        c, d = self.id[u], self.id[v]
+
+        if self.method == 'closure':
+            return self.closure[c] >> d & 1 == 1
+
+        if c == d:
+            return True
+        if c < d or not self.contains(c, d):
+            return False
+
+        stack, visited = [c], {c}
+
+        while stack:
+            for x in self.dag.adj[stack.pop()]:
+                if x == d:
+                    return True
+                if x > d and x not in visited and self.contains(x, d):
+                    visited.add(x)
+                    stack.append(x)
+
+        return False
+
+    def memory(self):
+        '''approximate size of the index in bytes'''
+        size = self.id.itemsize * len(self.id)
+
+        if self.method == 'closure':
+            size += sum(sys.getsizeof(reach) for reach in self.closure)
+        else:
+            size += self.dag.adj.nbytes()
+            size += sum(a.itemsize * len(a) for a in self.lows + self.posts)
+
+        return size
 
 # directed cycle
 V1 = 13
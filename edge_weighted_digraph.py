@@ -1,6 +1,19 @@
 # edge_weighted_digraph.py
 
+import heapq
+import operator
+from array import array
+from collections import deque
+
+import graph_io
+from csr import CSR
+from digraph import DirectedCycle, FrozenDigraph
+from priority_queue import IndexMinPriorityQueue
+from shared_graph import FreezableStorage, FrozenStorage
+
 class Edge:
+    __slots__ = ('hd', 'tl', 'wt')
+
     def __init__(self, v, w, wt):
         self.hd = v
         self.tl = w
@@ -22,11 +35,42 @@ class Edge:
         return f'{self.hd}->{self.tl} {self.wt:.2f}'
 
 
-class EdgeWeightedDigraph:
+class EdgeWeightedDigraph(FreezableStorage):
     def __init__(self, n):
         self.V, self.E = n, 0
         self.adj = [[] for v in range(self.V)]
 
+    @classmethod
+    def from_edges(cls, n, edges):
+        '''builds a digraph from (v, w, weight) triples or an (N, 3) NumPy
+        array'''
+        g = cls(n)
+        g.add_edges(*graph_io.edge_columns(edges, 3, n))
+        return g
+
+    @classmethod
+    def from_lines(cls, lines):
+        '''builds a digraph from the lines of a tinyEWD-format edge list'''
+        n, columns = graph_io.read_edge_list(lines, weighted=True)
+        g = cls(n)
+        g.add_edges(*columns)
+        return g
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path) as f:
+            return cls.from_lines(f)
+
+    def add_edges(self, vs, ws, weights):
+        '''adds an edge from vs[i] to ws[i] of weight weights[i] for
+        each i'''
+        adj = self.adj
+
+        for v, w, x in zip(vs, ws, weights):
+            adj[v].append(Edge(v, w, x))
+
+        self.E += len(vs)
+
     def add(self, e):
         self.adj[e.head()].append(e)
         self.E += 1
@@ -52,6 +96,470 @@ class EdgeWeightedDigraph:
 
         return '\n'.join(lines)
 
+    def freeze(self):
+        '''returns a read-only copy of the digraph in compressed sparse row form'''
+        offsets = array('q', bytes(8 * (self.V + 1)))
+        targets, weights = array('i'), array('d')
+
+        for v in range(self.V):
+            for e in self.adj[v]:
+                targets.append(e.tail())
+                weights.append(e.weight())
+
+            offsets[v + 1] = len(targets)
+
+        return FrozenEdgeWeightedDigraph(CSR(offsets, targets, weights), self.E)
+
+    def reverse(self):
+        '''the digraph with each edge reversed'''
+        rev = EdgeWeightedDigraph(self.V)
+
+        for e in self.edges():
+            rev.add_edge(e.tail(), e.head(), e.weight())
+
+        return rev
+
+    def in_degrees(self):
+        '''the number of edges into each vertex, as a list'''
+        indegree = [0] * self.V
+
+        for edges in self.adj:
+            for e in edges:
+                indegree[e.tl] += 1
+
+        return indegree
+
+    def unweighted(self):
+        '''the digraph with the weights dropped, as a FrozenDigraph'''
+        return FrozenDigraph(CSR.from_lists(
+            [[e.tl for e in edges] for edges in self.adj]), self.E)
+
+
+class EdgeViews:
+    '''adjacency lists of a frozen digraph: self[v] is a list of Edge objects
+    made from the CSR entries of v'''
+    def __init__(self, csr):
+        self.csr = csr
+
+    def __len__(self):
+        return len(self.csr)
+
+    def __getitem__(self, v):
+        lo, hi = self.csr.offsets[v], self.csr.offsets[v + 1]
+        ws, xs = self.csr.targets[lo:hi], self.csr.weights[lo:hi]
+
+        return [Edge(v, w, x) for w, x in zip(ws, xs)]
+
+
+class FrozenEdgeWeightedDigraph(FrozenStorage):
+    '''Read-only edge-weighted digraph stored as a CSR of the tails and
+    weights of each vertex's edges. Edge objects are only created when
+    edges are asked for.'''
+    kind = 'edge_weighted_digraph'
+
+    def __init__(self, csr, m):
+        self.V, self.E = len(csr), m
+        self.csr = csr
+        self.adj = EdgeViews(csr)
+
+    def parts(self):
+        return self.csr, self.E
+
+    def reverse(self):
+        '''the digraph with each edge reversed, built by counting sort'''
+        return FrozenEdgeWeightedDigraph(self.csr.transpose(), self.E)
+
+    def in_degrees(self):
+        '''the number of edges into each vertex, as a list, counted from the
+        CSR's targets without making Edge objects'''
+        np = graph_io.np
+
+        if np is not None:
+            return np.bincount(np.asarray(self.csr.targets), minlength=self.V).tolist()
+
+        indegree = [0] * self.V
+
+        for w in self.csr.targets:
+            indegree[w] += 1
+
+        return indegree
+
+    def unweighted(self):
+        '''the digraph with the weights dropped, sharing this one's arrays'''
+        return FrozenDigraph(CSR(self.csr.offsets, self.csr.targets), self.E)
+
+    def edges(self):
+        for v in range(self.V):
+            for e in self.adj[v]:
+                yield e
+
+    def edge_list(self):
+        return list(self.edges())
+
+
+class DijkstraSP:
+    '''Dijkstra's algorithm from s, for non-negative edge weights, using an
+    indexed priority queue with decrease-key so it holds at most V entries.
+
+    If target is given the search stops as soon as the target is settled.
+    If radius is given only vertices at distance at most radius are
+    settled, so reachable() lists everything within that cost. Distances
+    and paths are only known for settled vertices; other vertices are
+    treated as unreachable. These searches usually see a small part of g,
+    so they keep distances in dicts and use a heapq list with lazy
+    deletion, and cost nothing in proportion to V.'''
+    def __init__(self, g, s, target=None, radius=None, tracer=None):
+        self.s = s
+        self.settled = list()
+        self.tracer = tracer
+        self.bounded = target is not None or radius is not None
+
+        if self.bounded:
+            self.dist, self.edge_to, self.marked = {s: 0}, dict(), set()
+            self.bounded_dijkstra(g, s, target, radius)
+        else:
+            self.dist = [float('inf')] * g.V
+            self.edge_to = [None] * g.V
+            self.marked = [False] * g.V
+            self.dijkstra(g, s)
+
+    def dijkstra(self, g, s):
+        dist, edge_to, marked = self.dist, self.edge_to, self.marked
+        pq = IndexMinPriorityQueue(g.V)
+        tracer = self.tracer
+
+        dist[s] = 0
+        pq.insert(s, 0)
+
+        while not pq.empty():
+            v = pq.remove_min()
+            marked[v] = True
+            self.settled.append(v)
+
+            if tracer is not None:
+                tracer.vertex_visited(v)
+
+            for e in g.adj[v]:
+                w, d = e.tl, dist[v] + e.wt
+
+                if tracer is not None:
+                    tracer.edge_examined(v, w)
+
+                if d < dist[w]:
+                    if tracer is not None:
+                        tracer.edge_relaxed(e)
+
+                    dist[w] = d
+                    edge_to[w] = e
+
+                    if pq.contains(w):
+                        pq.decrease_key(w, d)
+                    else:
+                        pq.insert(w, d)
+
+    def bounded_dijkstra(self, g, s, target, radius):
+        dist, edge_to, marked = self.dist, self.edge_to, self.marked
+        heap = [(0, s)]
+        tracer = self.tracer
+
+        if radius is None:
+            radius = float('inf')
+
+        while heap:
+            _, v = heapq.heappop(heap)
+
+            # an entry left behind when v was reached by a shorter path
+            if v in marked:
+                continue
+
+            marked.add(v)
+            self.settled.append(v)
+
+            if tracer is not None:
+                tracer.vertex_visited(v)
+
+            if v == target:
+                break
+
+            for e in g.adj[v]:
+                w, d = e.tl, dist[v] + e.wt
+
+                if tracer is not None:
+                    tracer.edge_examined(v, w)
+
+                if d < dist.get(w, float('inf')) and d <= radius:
+                    if tracer is not None:
+                        tracer.edge_relaxed(e)
+
+                    dist[w] = d
+                    edge_to[w] = e
+                    heapq.heappush(heap, (d, w))
+
+    def has_path_to(self, v):
+        return v in self.marked if self.bounded else self.marked[v]
+
+    def dist_to(self, v):
+        return self.dist[v] if self.has_path_to(v) else float('inf')
+
+    def path_to(self, v):
+        '''the edges of a shortest path from s to v, or None'''
+        if not self.has_path_to(v):
+            return None
+
+        path = list()
+
+        while v != self.s:
+            path.append(self.edge_to[v])
+            v = self.edge_to[v].head()
+
+        path.reverse()
+
+        return path
+
+    def reachable(self):
+        '''the settled vertices, in increasing order of distance'''
+        return self.settled
+
+
+class BellmanFordSP:
+    '''Queue-based Bellman-Ford from s, for edge weights of any sign. Only
+    vertices whose distance changed are queued for their edges to be
+    relaxed again, so most graphs take far fewer than V passes.
+
+    A negative cycle reachable from s would keep the queue from emptying,
+    so after every V relaxations the tree of edge_to edges is checked for a
+    cycle, which can only be a negative one. The search stops when one is
+    found and negative_cycle() returns its edges.'''
+    def __init__(self, g, s, tracer=None):
+        self.s = s
+        self.dist = [float('inf')] * g.V
+        self.edge_to = [None] * g.V
+        self.on_queue = [False] * g.V
+        self.queue = deque()
+        self.cost = 0
+        self.cycle = None
+        self.tracer = tracer
+
+        self.dist[s] = 0
+        self.queue.append(s)
+        self.on_queue[s] = True
+
+        while self.queue and self.cycle is None:
+            v = self.queue.popleft()
+            self.on_queue[v] = False
+
+            if self.tracer is not None:
+                self.tracer.vertex_visited(v)
+
+            self.relax(g, v)
+
+    def relax(self, g, v):
+        dist, edge_to = self.dist, self.edge_to
+
+        for e in g.adj[v]:
+            w, d = e.tl, dist[v] + e.wt
+
+            if self.tracer is not None:
+                self.tracer.edge_examined(v, w)
+
+            if d < dist[w]:
+                if self.tracer is not None:
+                    self.tracer.edge_relaxed(e)
+
+                dist[w] = d
+                edge_to[w] = e
+
+                if not self.on_queue[w]:
+                    self.queue.append(w)
+                    self.on_queue[w] = True
+
+            self.cost += 1
+
+            if self.cost % g.V == 0:
+                self.find_negative_cycle()
+
+                if self.cycle is not None:
+                    return
+
+    def find_negative_cycle(self):
+        '''follows the edge_to edges back from each vertex, looking for a
+        cycle'''
+        V, edge_to = len(self.edge_to), self.edge_to
+
+        # 0: not seen, 1: on the current walk, 2: on an earlier walk
+        state = [0] * V
+
+        for s in range(V):
+            v, walk = s, list()
+
+            while v is not None and state[v] == 0:
+                state[v] = 1
+                walk.append(v)
+                v = edge_to[v].head() if edge_to[v] is not None else None
+
+            if v is not None and state[v] == 1:
+                cycle, x = list(), v
+
+                while True:
+                    cycle.append(edge_to[x])
+                    x = edge_to[x].head()
+
+                    if x == v:
+                        break
+
+                cycle.reverse()
+                self.cycle = cycle
+                return
+
+            for x in walk:
+                state[x] = 2
+
+    def has_negative_cycle(self):
+        return self.cycle is not None
+
+    def negative_cycle(self):
+        '''the edges of a negative cycle reachable from s, or None'''
+        return self.cycle
+
+    def has_path_to(self, v):
+        return self.dist[v] < float('inf')
+
+    def dist_to(self, v):
+        if self.has_negative_cycle():
+            raise ValueError('negative cost cycle exists')
+        return self.dist[v]
+
+    def path_to(self, v):
+        '''the edges of a shortest path from s to v, or None'''
+        if self.has_negative_cycle():
+            raise ValueError('negative cost cycle exists')
+        if not self.has_path_to(v):
+            return None
+
+        path = list()
+
+        while v != self.s:
+            path.append(self.edge_to[v])
+            v = self.edge_to[v].head()
+
+        path.reverse()
+
+        return path
+
+
+class AcyclicSP:
+    '''Shortest paths in a DAG from s, or from every vertex at once if s is
+    None, for edge weights of any sign. Vertices are taken in topological
+    order by Kahn's algorithm run directly on g's edges, and each reached
+    vertex's edges are relaxed as it is taken, so it takes O(V + E) time
+    with no queue of keys and no copy of g. Raises ValueError if g has a
+    cycle.'''
+    unreached = float('inf')
+    better = staticmethod(operator.lt)
+
+    def __init__(self, g, s=None, tracer=None):
+        self.s = s
+        self.dist = [self.unreached] * g.V
+        self.edge_to = [None] * g.V
+        self.tracer = tracer
+
+        if s is None:
+            self.dist = [0] * g.V
+        else:
+            self.dist[s] = 0
+
+        if self.search(g) < g.V:
+            cycle = '->'.join(map(str, DirectedCycle(g.unweighted()).cycle))
+            raise ValueError(f'digraph has a cycle {cycle}')
+
+    def search(self, g):
+        '''Kahn's algorithm, relaxing the edges of each reached vertex as it
+        is taken. Returns the number of vertices taken, which is less than V
+        if g has a cycle.'''
+        adj, dist, unreached = g.adj, self.dist, self.unreached
+        indegree = g.in_degrees()
+
+        # any vertex with no edges left into it can go next, so a stack
+        # serves as well as a queue
+        ready = [v for v in range(g.V) if indegree[v] == 0]
+        taken = 0
+
+        while ready:
+            v = ready.pop()
+            edges = adj[v]
+            taken += 1
+
+            if dist[v] != unreached:
+                self.relax(v, edges)
+
+            for e in edges:
+                indegree[e.tl] -= 1
+
+                if indegree[e.tl] == 0:
+                    ready.append(e.tl)
+
+        return taken
+
+    def relax(self, v, edges):
+        dist, edge_to, better = self.dist, self.edge_to, self.better
+
+        if self.tracer is not None:
+            self.tracer.vertex_visited(v)
+
+        for e in edges:
+            w, d = e.tl, dist[v] + e.wt
+
+            if self.tracer is not None:
+                self.tracer.edge_examined(v, w)
+
+            if better(d, dist[w]):
+                if self.tracer is not None:
+                    self.tracer.edge_relaxed(e)
+
+                dist[w] = d
+                edge_to[w] = e
+
+    def has_path_to(self, v):
+        return self.dist[v] != self.unreached
+
+    def dist_to(self, v):
+        return self.dist[v]
+
+    def path_to(self, v):
+        '''the edges of the path found to v, or None'''
+        if not self.has_path_to(v):
+            return None
+
+        path = list()
+
+        while self.edge_to[v] is not None:
+            path.append(self.edge_to[v])
+            v = self.edge_to[v].head()
+
+        path.reverse()
+
+        return path
+
+
+class AcyclicLP(AcyclicSP):
+    '''Longest paths in a DAG from s, or from every vertex at once if s is
+    None, in O(V + E) time. With edge weights as task durations this is the
+    critical path method: the longest path of all is the chain of tasks
+    that sets the length of the schedule.'''
+    unreached = float('-inf')
+    better = staticmethod(operator.gt)
+
+    def critical_path_length(self):
+        '''the length of the longest path found'''
+        return max(self.dist, default=self.unreached)
+
+    def critical_path(self):
+        '''the edges of the longest path found, or None'''
+        if not self.dist:
+            return None
+
+        return self.path_to(max(range(len(self.dist)), key=self.dist.__getitem__))
+
 
 if __name__ == '__main__':
     V = 8
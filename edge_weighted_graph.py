@@ -1,8 +1,18 @@
 # edge_weighted_graph.py
 
-from priority_queue import MinPriorityQueue
+import multiprocessing
+import os
+from array import array
+
+import graph_io
+from csr import CSR
+from shared_graph import FreezableStorage, FrozenStorage
+from priority_queue import IndexMinPriorityQueue, MinPriorityQueue
+from union_find import WeightedQuickUnion
 
 class Edge:
+    __slots__ = ('v', 'w', 'wt')
+
     def __init__(self, v, w, x):
         self.v = v
         self.w = w
@@ -18,15 +28,11 @@ class Edge:
         return self.w if vertex == self.v else self.v
 
     def __eq__(self, other):
-        v1, v2 = self.either(), other.either()
-        w1, w2 = self.other(v1), other.other(v2)
-
-        if v1 > w1:
-            w1, v1 = v1, w1
-        if v2 > w2:
-            w2, v2 = v2, w2
+        if self.wt != other.wt:
+            return False
 
-        return v1 == v2 and w1 == w2 and self.weight() == other.weight()
+        return ((self.v == other.v and self.w == other.w) or
+                (self.v == other.w and self.w == other.v))
 
     def __lt__(self, other):
         return self.weight() < other.weight()
@@ -35,12 +41,52 @@ class Edge:
         return f'{self.v}-{self.w} {self.weight():.2f}'
 
 
-class EdgeWeightedGraph:
-    def __init__(self, n):
+class EdgeWeightedGraph(FreezableStorage):
+    def __init__(self, n, indexed=False):
         self.V = n
         self.E = 0
         self.adj = [[] for v in range(n)]
 
+        # if indexed, self.index[v][w] is the number of edges between v and w
+        self.index = [dict() for v in range(n)] if indexed else None
+
+    @classmethod
+    def from_edges(cls, n, edges, indexed=False):
+        '''builds a graph from (v, w, weight) triples or an (N, 3) NumPy array'''
+        g = cls(n, indexed)
+        g.add_edges(*graph_io.edge_columns(edges, 3, n))
+        return g
+
+    @classmethod
+    def from_lines(cls, lines, indexed=False):
+        '''builds a graph from the lines of a tinyEWG-format edge list'''
+        n, columns = graph_io.read_edge_list(lines, weighted=True)
+        g = cls(n, indexed)
+        g.add_edges(*columns)
+        return g
+
+    @classmethod
+    def from_file(cls, path, indexed=False):
+        with open(path) as f:
+            return cls.from_lines(f, indexed)
+
+    def add_edges(self, vs, ws, weights):
+        '''adds an edge between vs[i] and ws[i] of weight weights[i]
+        for each i'''
+        if self.index is not None:
+            for v, w, x in zip(vs, ws, weights):
+                self.add_edge(Edge(v, w, x))
+            return
+
+        adj = self.adj
+
+        for v, w, x in zip(vs, ws, weights):
+            e = Edge(v, w, x)
+            adj[v].append(e)
+            adj[w].append(e)
+
+        self.E += len(vs)
+
     def add_edge(self, e):
         v = e.either()
         w = e.other(v)
@@ -48,12 +94,26 @@ class EdgeWeightedGraph:
         self.adj[w].append(e)
         self.E += 1
 
+        if self.index is not None:
+            self.index[v][w] = self.index[v].get(w, 0) + 1
+            self.index[w][v] = self.index[w].get(v, 0) + 1
+
     def are_adjacent(self, v, w):
+        if self.index is not None:
+            return w in self.index[v]
+
         for e in self.adjacent_edges(v):
             if e.other(v) == w:
                 return True
         return False
 
+    def multiplicity(self, v, w):
+        '''number of parallel edges between v and w'''
+        if self.index is not None:
+            return self.index[v].get(w, 0)
+
+        return sum(1 for e in self.adjacent_edges(v) if e.other(v) == w)
+
     def adjacent_edges(self, v):
         return iter(self.adj[v])
 
@@ -77,6 +137,11 @@ class EdgeWeightedGraph:
                     yield e
 
 
+    def edge_columns(self):
+        '''the endpoints and weights of the edges, as three columns'''
+        edges = list(self.edges())
+        return [e.v for e in edges], [e.w for e in edges], [e.wt for e in edges]
+
     def __repr__(self):
         str_parts = [None for _ in range(self.E + 1)]
 
@@ -90,6 +155,221 @@ class EdgeWeightedGraph:
 
         return '\n'.join(str_parts)
 
+    def freeze(self):
+        '''returns a read-only copy of the graph in compressed sparse row form'''
+        offsets = array('q', bytes(8 * (self.V + 1)))
+        targets, weights = array('i'), array('d')
+
+        for v in range(self.V):
+            for e in self.adj[v]:
+                targets.append(e.other(v))
+                weights.append(e.weight())
+
+            offsets[v + 1] = len(targets)
+
+        return FrozenEdgeWeightedGraph(CSR(offsets, targets, weights), self.E)
+
+
+class CompactEdgeWeightedGraph(EdgeWeightedGraph):
+    '''Edge-weighted graph that stores its edges as parallel typed arrays
+    rather than Edge objects: edge i joins vs[i] and ws[i] with weight
+    weights[i]. Each edge has two half-edges, 2i from vs[i] and 2i + 1 from
+    ws[i], and the half-edges of each vertex form a linked list through
+    head, nxt and tail, kept in the order edges were added. An edge takes
+    24 bytes and a vertex 8, and Edge objects are only created, as copies,
+    when edges are asked for.'''
+    def __init__(self, n, indexed=False):
+        self.V = n
+        self.E = 0
+        self.vs, self.ws, self.weights = array('i'), array('i'), array('d')
+        self.head = array('i', [-1]) * n
+        self.tail = array('i', [-1]) * n
+        self.nxt = array('i')
+
+        # if indexed, self.index[v][w] is the number of edges between v and w
+        self.index = [dict() for v in range(n)] if indexed else None
+
+    def add_edges(self, vs, ws, weights):
+        '''adds an edge between vs[i] and ws[i] of weight weights[i]
+        for each i'''
+        if self.index is not None:
+            for v, w, x in zip(vs, ws, weights):
+                self.add(v, w, x)
+            return
+
+        h = 2 * self.E
+        self.vs.extend(vs)
+        self.ws.extend(ws)
+        self.weights.extend(weights)
+        self.nxt.extend(array('i', [-1]) * (2 * len(vs)))
+
+        head, tail, nxt = self.head, self.tail, self.nxt
+
+        for v, w in zip(vs, ws):
+            for x in (v, w):
+                if tail[x] == -1:
+                    head[x] = h
+                else:
+                    nxt[tail[x]] = h
+
+                tail[x] = h
+                h += 1
+
+        self.E += len(vs)
+
+    def add_edge(self, e):
+        self.add(e.v, e.w, e.wt)
+
+    def add(self, v, w, x):
+        '''adds an edge between v and w of weight x'''
+        i = self.E
+        self.vs.append(v)
+        self.ws.append(w)
+        self.weights.append(x)
+        self.nxt.extend((-1, -1))
+        self.link(v, 2 * i)
+        self.link(w, 2 * i + 1)
+        self.E += 1
+
+        if self.index is not None:
+            self.index[v][w] = self.index[v].get(w, 0) + 1
+            self.index[w][v] = self.index[w].get(v, 0) + 1
+
+    def link(self, v, h):
+        if self.tail[v] == -1:
+            self.head[v] = h
+        else:
+            self.nxt[self.tail[v]] = h
+
+        self.tail[v] = h
+
+    def edge(self, i):
+        return Edge(self.vs[i], self.ws[i], self.weights[i])
+
+    def edge_indices(self, v):
+        '''indices of the edges incident to v'''
+        h, nxt = self.head[v], self.nxt
+
+        while h != -1:
+            yield h >> 1
+            h = nxt[h]
+
+    def adjacent_edges(self, v):
+        for i in self.edge_indices(v):
+            yield self.edge(i)
+
+    def edges(self):
+        for i in range(self.E):
+            if self.vs[i] != self.ws[i]:
+                yield self.edge(i)
+
+    def edge_list(self):
+        return list(self.edges())
+
+    def edge_columns(self):
+        return self.vs, self.ws, self.weights
+
+    def freeze(self):
+        '''returns a read-only copy of the graph in compressed sparse row form'''
+        if graph_io.np is not None:
+            np = graph_io.np
+            vs, ws = np.asarray(self.vs), np.asarray(self.ws)
+            csr = CSR.from_pairs(self.V, np.stack([vs, ws], axis=1).ravel(),
+                                 np.stack([ws, vs], axis=1).ravel(),
+                                 np.repeat(np.asarray(self.weights), 2))
+
+            return FrozenEdgeWeightedGraph(csr, self.E)
+
+        sources = [None] * (2 * self.E)
+        sources[0::2], sources[1::2] = self.vs, self.ws
+        targets = [None] * (2 * self.E)
+        targets[0::2], targets[1::2] = self.ws, self.vs
+        weights = [None] * (2 * self.E)
+        weights[0::2] = weights[1::2] = self.weights
+
+        csr = CSR.from_pairs(self.V, sources, targets, weights)
+
+        return FrozenEdgeWeightedGraph(csr, self.E)
+
+
+class FrozenEdgeWeightedGraph(FrozenStorage):
+    '''Read-only edge-weighted graph stored as a CSR of neighbours and
+    weights. Edge objects are only created when edges are asked for.'''
+    kind = 'edge_weighted_graph'
+
+    def __init__(self, csr, m):
+        self.V = len(csr)
+        self.E = m
+        self.adj = csr
+
+    def parts(self):
+        return self.adj, self.E
+
+    def are_adjacent(self, v, w):
+        return w in self.adj[v]
+
+    def adjacent_edges(self, v):
+        lo, hi = self.adj.offsets[v], self.adj.offsets[v + 1]
+
+        for w, x in zip(self.adj.targets[lo:hi], self.adj.weights[lo:hi]):
+            yield Edge(v, w, x)
+
+    def edges(self):
+        for v in range(self.V):
+            for e in self.adjacent_edges(v):
+                if e.other(v) > v:
+                    yield e
+
+    def edge_list(self):
+        return list(self.edges())
+
+    def edge_columns(self):
+        '''the endpoints and weights of the edges, as three columns (NumPy
+        arrays if NumPy is installed), read from the CSR without creating
+        Edge objects'''
+        if graph_io.np is not None:
+            np = graph_io.np
+            offsets = np.asarray(self.adj.offsets)
+            sources = np.repeat(np.arange(self.V, dtype=np.int32), np.diff(offsets))
+            targets = np.asarray(self.adj.targets)
+            upper = targets > sources
+
+            return sources[upper], targets[upper], np.asarray(self.adj.weights)[upper]
+
+        vs, ws, weights = list(), list(), list()
+
+        for v in range(self.V):
+            lo, hi = self.adj.offsets[v], self.adj.offsets[v + 1]
+
+            for w, x in zip(self.adj.targets[lo:hi], self.adj.weights[lo:hi]):
+                if w > v:
+                    vs.append(v)
+                    ws.append(w)
+                    weights.append(x)
+
+        return vs, ws, weights
+
+
+def edges_by_weight(g):
+    '''Yields (v, w, weight) for each edge of g in increasing order of
+    weight. The weights are sorted in bulk, by NumPy argsort if NumPy is
+    installed, and edges are converted back to Python values a chunk at a
+    time, so stopping early skips the rest.'''
+    vs, ws, weights = g.edge_columns()
+
+    if graph_io.np is not None:
+        np = graph_io.np
+        vs, ws, weights = np.asarray(vs), np.asarray(ws), np.asarray(weights)
+        order = np.argsort(weights, kind='stable')
+
+        for start in range(0, len(order), graph_io.CHUNK):
+            chunk = order[start:start + graph_io.CHUNK]
+            yield from zip(vs[chunk].tolist(), ws[chunk].tolist(),
+                           weights[chunk].tolist())
+    else:
+        for i in sorted(range(len(weights)), key=weights.__getitem__):
+            yield vs[i], ws[i], weights[i]
+
 
 class MST:
     def edges(self):
@@ -106,11 +386,12 @@ class MST:
 
 
 class LazyPrimMST(MST):
-    def __init__(self, g):
+    def __init__(self, g, tracer=None):
         self.marked = [False for v in range(g.V)]
         self.mst_edges = list()
         self.pq = MinPriorityQueue()
         self.wt = 0
+        self.tracer = tracer
 
         self.prim(g)
 
@@ -125,8 +406,13 @@ class LazyPrimMST(MST):
             w = curr_edge.other(v)
 
             if self.marked[v] and self.marked[w]:
+                if self.tracer is not None:
+                    self.tracer.edge_rejected(curr_edge)
                 continue
 
+            if self.tracer is not None:
+                self.tracer.edge_accepted(curr_edge)
+
             self.mst_edges.append(curr_edge)
             self.wt += curr_edge.weight()
 
@@ -139,7 +425,13 @@ class LazyPrimMST(MST):
     def visit(self, g, v):
         self.marked[v] = True
 
+        if self.tracer is not None:
+            self.tracer.vertex_visited(v)
+
         for e in g.adjacent_edges(v):
+            if self.tracer is not None:
+                self.tracer.edge_examined(v, e.other(v))
+
             if not self.marked[e.other(v)]:
                 self.pq.insert(e)
 
@@ -154,75 +446,314 @@ class LazyPrimMST(MST):
         return self.wt
 
 
-class KruskalMST:
-    def __init__(self, g):
-        # parent vertex of v: initially, there are V single vertex trees
-        self.parent = [v for v in range(g.V)]
+class EagerPrimMST(MST):
+    '''Prim's algorithm keeping, for each vertex not yet in the tree, only
+    the lightest edge connecting it to the tree: edge_to[w] and dist_to[w].
+    The candidates are held in an indexed priority queue keyed by vertex,
+    so it holds at most V entries and a lighter edge decreases the key of
+    its vertex instead of adding a stale entry. Grows a tree from every
+    vertex not yet reached, giving a minimum spanning forest.'''
+    def __init__(self, g, tracer=None):
+        self.marked = [False for v in range(g.V)]
+        self.edge_to = [None for v in range(g.V)]
+        self.dist_to = [float('inf') for v in range(g.V)]
+        self.mst_edges = list()
+        self.pq = IndexMinPriorityQueue(g.V)
+        self.wt = 0
+        self.tracer = tracer
 
-        # if v is a root, self.size[v] is the size of the tree rooted at v
-        self.size = [1 for v in range(g.V)]
+        for v in range(g.V):
+            if not self.marked[v]:
+                self.prim(g, v)
 
-        # mst is initially empty with 0 weight
-        self.mst, self.wt = list(), 0
+    def prim(self, g, s):
+        self.dist_to[s] = 0
+        self.pq.insert(s, 0)
 
-        # build PQ containing each edge
-        edge_pq = MinPriorityQueue()
+        while not self.pq.empty():
+            v = self.pq.remove_min()
+            e = self.edge_to[v]
 
-        for e in g.edges():
-            edge_pq.insert(e)
+            if e is not None:
+                if self.tracer is not None:
+                    self.tracer.edge_accepted(e)
 
-        self.edge_pq = edge_pq
+                self.mst_edges.append(e)
+                self.wt += e.weight()
 
-        # run Kruskal's algorithm
-        self.kruskal(g)
+            self.visit(g, v)
 
+    def visit(self, g, v):
+        self.marked[v] = True
 
-    def kruskal(self, g):
-        while not self.edge_pq.empty():
-            # get current edge of minimum weight
-            e = self.edge_pq.remove_min()
+        if self.tracer is not None:
+            self.tracer.vertex_visited(v)
 
-            v = e.either()
+        for e in g.adjacent_edges(v):
             w = e.other(v)
 
-            # get root vertex for v and w
-            i, j = self.find(v), self.find(w)
+            if self.tracer is not None:
+                self.tracer.edge_examined(v, w)
+
+            if self.marked[w] or not e.weight() < self.dist_to[w]:
+                continue
+
+            if self.tracer is not None:
+                self.tracer.edge_relaxed(e)
+
+            self.edge_to[w] = e
+            self.dist_to[w] = e.weight()
+
+            if self.pq.contains(w):
+                self.pq.decrease_key(w, e.weight())
+            else:
+                self.pq.insert(w, e.weight())
+
+    def edges(self):
+        for e in self.mst_edges:
+            yield e
+
+    def edge_list(self):
+        return self.mst_edges
+
+    def weight(self):
+        return self.wt
 
+
+class KruskalMST(MST):
+    '''Kruskal's algorithm: takes edges in increasing order of weight from
+    edges_by_weight, keeping those that join two trees of the forest in a
+    weighted union-find. Stops once V - 1 edges are accepted, as the forest
+    is then a spanning tree. Edge objects are only created for accepted
+    edges (and for rejected ones if there is a tracer).'''
+    def __init__(self, g, tracer=None):
+        self.uf = WeightedQuickUnion(g.V)
+
+        # mst is initially empty with 0 weight
+        self.mst, self.wt = list(), 0
+
+        self.tracer = tracer
+
+        # run Kruskal's algorithm
+        self.kruskal(g)
+
+    def kruskal(self, g):
+        if g.V <= 1:
+            return
+
+        union = self.uf.union
+
+        for v, w, x in edges_by_weight(g):
             # skip edge if both its vertices belong to the same tree
-            if i == j:
+            if not union(v, w):
+                if self.tracer is not None:
+                    self.tracer.edge_rejected(Edge(v, w, x))
                 continue
 
+            e = Edge(v, w, x)
+
+            if self.tracer is not None:
+                self.tracer.edge_accepted(e)
+                self.tracer.union_performed(v, w)
+
             # otherwise, add edge to mst
             self.mst.append(e)
+            self.wt += x
 
-            # update MST weight
-            self.wt += e.weight()
+            if len(self.mst) == g.V - 1:
+                break
 
-            # and add smaller tree to larger
-            if self.size[i] < self.size[j]:
-                self.size[j] += self.size[i]
-                self.parent[i] = j
-            else:
-                self.size[i] += self.size[j]
-                self.parent[j] = i
+    def edges(self):
+        for e in self.mst:
+            yield e
+
+    def edge_list(self):
+        return self.mst
+
+    def weight(self):
+        return self.wt
+
+
+# fewest edges a BoruvkaMST worker process is given; below this the cost
+# of starting a pool and sending it the labels each round outweighs the
+# search
+MIN_PART = 1 << 18
+
+# the sorted edge columns searched by a BoruvkaMST worker process, set
+# once when the pool starts; only worker processes use it
+_sorted_edges = None
+
+def _init_boruvka(vs, ws):
+    global _sorted_edges
+    _sorted_edges = vs, ws
+
+def _cheapest_part(labels, count, lo, hi, none):
+    '''_cheapest on the sorted edges held by a worker process'''
+    vs, ws = _sorted_edges
+    return _cheapest(vs, ws, labels, count, lo, hi, none)
+
+def _cheapest(vs, ws, labels, count, lo, hi, none):
+    '''For each of the count components in labels, returns the position of
+    the first edge in positions lo to hi of the sorted edges vs, ws that
+    leaves the component, or none if there is no such edge.'''
+    if graph_io.np is not None:
+        np = graph_io.np
+        cv, cw = labels[vs[lo:hi]], labels[ws[lo:hi]]
+        crossing = np.flatnonzero(cv != cw)
+        best = np.full(count, none, dtype=np.int64)
+
+        np.minimum.at(best, cv[crossing], crossing + lo)
+        np.minimum.at(best, cw[crossing], crossing + lo)
+
+        return best
+
+    best = [none] * count
+
+    for i in range(lo, hi):
+        a, b = labels[vs[i]], labels[ws[i]]
+
+        if a != b:
+            if best[a] == none:
+                best[a] = i
+            if best[b] == none:
+                best[b] = i
+
+    return best
+
+
+class BoruvkaMST(MST):
+    '''Boruvka's algorithm: in each round every component of the forest
+    finds its cheapest outgoing edge, those edges are added and the
+    components they join are contracted, until no edge leaves a component.
+    Edges are ordered by weight and then by their position in
+    g.edge_columns(), as in KruskalMST, so ties are broken the same way and
+    the forest is the same as KruskalMST's.
+
+    The edges are sorted once and split into up to processes parts of at
+    least MIN_PART edges. If there is more than one part, in each round a
+    process pool searches the parts in parallel, and only the component
+    label of each vertex is sent to the workers. With NumPy the search of
+    each part is vectorised. processes defaults to 1, which starts no
+    pool; processes=None uses one per CPU.'''
+    def __init__(self, g, processes=1, tracer=None):
+        self.mst, self.wt = list(), 0
+        self.processes = processes or os.cpu_count() or 1
+        self.tracer = tracer
 
-    def find(self, v):
-        '''finds parent vertex of i: if i is a tree, returns i.'''
-        w = self.parent[v]
+        self.boruvka(g)
 
-        if v == w:
-            return v
+    def boruvka(self, g):
+        np = graph_io.np
+        vs, ws, weights = g.edge_columns()
+
+        if np is not None:
+            vs, ws, weights = np.asarray(vs), np.asarray(ws), np.asarray(weights)
+            order = np.argsort(weights, kind='stable')
+            vs, ws, weights = vs[order], ws[order], weights[order]
+            labels = np.arange(g.V, dtype=np.int32)
         else:
-            self.parent[v] = self.find(w)
-            return self.parent[v]
+            order = sorted(range(len(weights)), key=weights.__getitem__)
+            vs, ws = [vs[i] for i in order], [ws[i] for i in order]
+            weights = [weights[i] for i in order]
+            labels = list(range(g.V))
+
+        m = len(weights)
+        step = max(MIN_PART, -(-m // self.processes))
+        parts = [(lo, min(lo + step, m)) for lo in range(0, m, step)]
 
-    def union(self, i, j):
-        '''combines the trees rooted at i and j.'''
-        if self.size[i] < self.size[j]:
-            self.parent[i] = j
+        if len(parts) > 1:
+            pool = multiprocessing.Pool(len(parts), _init_boruvka, (vs, ws))
         else:
-            self.parent[j] = i
+            pool = None
+
+        accepted, count = list(), g.V
+
+        try:
+            while count > 1 and parts:
+                tasks = [(labels, count, lo, hi, m) for lo, hi in parts]
+
+                if pool is not None:
+                    results = pool.starmap(_cheapest_part, tasks)
+                else:
+                    results = [_cheapest(vs, ws, *task) for task in tasks]
+
+                if np is not None:
+                    chosen, labels, new_count = self.contract_arrays(
+                        np.minimum.reduce(results), vs, ws, labels, count, m)
+                else:
+                    best = [min(edges) for edges in zip(*results)]
+                    chosen, labels, new_count = self.contract_lists(
+                        best, vs, ws, labels, count, m)
+
+                for i in chosen:
+                    accepted.append(i)
+
+                    if self.tracer is not None:
+                        v, w = int(vs[i]), int(ws[i])
+                        self.tracer.edge_accepted(Edge(v, w, float(weights[i])))
+                        self.tracer.union_performed(v, w)
+
+                if new_count == count:
+                    break
+
+                count = new_count
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+        # list the edges in the order KruskalMST accepts them
+        for i in sorted(accepted):
+            e = Edge(int(vs[i]), int(ws[i]), float(weights[i]))
+            self.mst.append(e)
+            self.wt += e.weight()
 
+    def contract_lists(self, best, vs, ws, labels, count, none):
+        '''Joins the components along their cheapest edges, given as best.
+        Returns the positions of the edges added, the new label of each
+        vertex and the new number of components.'''
+        uf = WeightedQuickUnion(count)
+        chosen = list()
+
+        for i in best:
+            # both components of an edge may choose it
+            if i != none and uf.union(labels[vs[i]], labels[ws[i]]):
+                chosen.append(i)
+
+        # number the contracted components from 0
+        roots = dict()
+        new_label = [roots.setdefault(uf.find(c), len(roots)) for c in range(count)]
+
+        return chosen, [new_label[c] for c in labels], uf.count
+
+    def contract_arrays(self, best, vs, ws, labels, count, none):
+        '''contract_lists on NumPy arrays, finding the new components by
+        pointer jumping instead of union-find'''
+        np = graph_io.np
+        components = np.arange(count)
+        sources = np.flatnonzero(best != none)
+        chosen = best[sources]
+
+        # each component points to the other end of its cheapest edge; since
+        # edges are totally ordered the only cycles are pairs of components
+        # choosing the same edge, which are broken at the lower component
+        cv, cw = labels[vs[chosen]], labels[ws[chosen]]
+        parent = components.copy()
+        parent[sources] = np.where(cv == sources, cw, cv)
+
+        pair = (parent[parent] == components) & (components < parent)
+        parent[pair] = components[pair]
+
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+
+        roots, new_label = np.unique(parent, return_inverse=True)
+        labels = new_label.astype(np.int32)[labels]
+
+        return np.unique(chosen).tolist(), labels, len(roots)
 
     def edges(self):
         for e in self.mst:
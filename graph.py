@@ -1,13 +1,148 @@
 # graph.py
 
-import sys
+import graph_io
+from csr import CSR
+from shared_graph import FreezableStorage, FrozenStorage
+from traversal import bidirectional_bfs, breadth_first, depth_first
+from union_find import WeightedQuickUnion
 
-class Graph:
-    def __init__(self, n):
+class Neighbours:
+    '''Adjacency list that also maps each neighbour to its positions, so
+    membership tests, counts and removals take constant expected time.
+
+    remove(w) drops the first w, leaving None in its place, so the order is
+    always the one a plain list would have. The gaps are closed up before
+    the list is read, and whenever they make up half of it. positions[w] is
+    the position of w, or a list of its positions if it has parallel edges.'''
+    __slots__ = ('items', 'positions', 'gaps')
+
+    def __init__(self):
+        self.items = list()
+        self.positions = dict()
+        self.gaps = 0
+
+    def append(self, w):
+        p = self.positions.get(w)
+
+        if p is None:
+            self.positions[w] = len(self.items)
+        elif isinstance(p, int):
+            self.positions[w] = [p, len(self.items)]
+        else:
+            p.append(len(self.items))
+
+        self.items.append(w)
+
+    def remove(self, w):
+        p = self.positions.get(w)
+
+        if p is None:
+            raise ValueError('Neighbours.remove(x): x not in list')
+
+        if isinstance(p, int):
+            del self.positions[w]
+        else:
+            p, rest = p[0], p[1:]
+            self.positions[w] = rest[0] if len(rest) == 1 else rest
+
+        self.items[p] = None
+        self.gaps += 1
+
+        if 2 * self.gaps > len(self.items):
+            self.compact()
+
+    def compact(self):
+        '''closes up the gaps left by remove'''
+        self.items = [w for w in self.items if w is not None]
+        self.positions = dict()
+        self.gaps = 0
+
+        for i, w in enumerate(self.items):
+            p = self.positions.get(w)
+
+            if p is None:
+                self.positions[w] = i
+            elif isinstance(p, int):
+                self.positions[w] = [p, i]
+            else:
+                p.append(i)
+
+    def count(self, w):
+        p = self.positions.get(w)
+
+        if p is None:
+            return 0
+
+        return 1 if isinstance(p, int) else len(p)
+
+    def __contains__(self, w):
+        return w in self.positions
+
+    def __len__(self):
+        return len(self.items) - self.gaps
+
+    def __iter__(self):
+        if self.gaps:
+            self.compact()
+
+        return iter(self.items)
+
+    def __getitem__(self, i):
+        if self.gaps:
+            self.compact()
+
+        return self.items[i]
+
+    def __eq__(self, other):
+        if not isinstance(other, (list, Neighbours)):
+            return NotImplemented
+
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return f'Neighbours({list(self)})'
+
+
+class Graph(FreezableStorage):
+    def __init__(self, n, indexed=False):
         self.V = n
         self.M = 0
         self.vertices = list(range(n))
-        self.adj = [[] for _ in range(n)]
+
+        if indexed:
+            self.adj = [Neighbours() for _ in range(n)]
+        else:
+            self.adj = [[] for _ in range(n)]
+
+    @classmethod
+    def from_edges(cls, n, edges, indexed=False):
+        '''builds a graph from (v, w) pairs or an (N, 2) NumPy array'''
+        g = cls(n, indexed)
+        g.add_edges(*graph_io.edge_columns(edges, 2, n))
+        return g
+
+    @classmethod
+    def from_lines(cls, lines, indexed=False):
+        '''builds a graph from the lines of a tinyG-format edge list'''
+        n, columns = graph_io.read_edge_list(lines)
+        g = cls(n, indexed)
+        g.add_edges(*columns)
+        return g
+
+    @classmethod
+    def from_file(cls, path, indexed=False):
+        with open(path) as f:
+            return cls.from_lines(f, indexed)
+
+    def add_edges(self, vs, ws):
+        '''adds an edge between vs[i] and ws[i] for each i'''
+        adj = self.adj
+
+        for v, w in zip(vs, ws):
+            adj[v].append(w)
+            adj[w].append(v)
+
+        self.M += len(vs)
 
     def add_edge(self, v, w):
         self.adj[v].append(w)
@@ -23,41 +158,84 @@ class Graph:
         return self.adj[v]
 
     def adjacent(self, v, w):
-        for k in self.adj[v]:
-            if k == w:
-                return True
+        return w in self.adj[v]
+
+    def multiplicity(self, v, w):
+        '''number of parallel edges between v and w'''
+        return self.adj[v].count(w)
+
+    def reverse(self):
+        '''an undirected graph is its own reverse'''
+        return self
+
+    def freeze(self):
+        '''returns a read-only copy of the graph in compressed sparse row form'''
+        return FrozenGraph(CSR.from_lists(self.adj), self.M)
+
+
+class FrozenGraph(FrozenStorage):
+    kind = 'graph'
+
+    def __init__(self, csr, m):
+        self.V = len(csr)
+        self.M = m
+        self.vertices = range(self.V)
+        self.adj = csr
+
+    def parts(self):
+        return self.adj, self.M
+
+    @classmethod
+    def from_edges(cls, n, edges):
+        '''builds a frozen graph directly from (v, w) pairs or an (N, 2)
+        NumPy array, without building adjacency lists first'''
+        np = graph_io.np
+
+        if np is not None and isinstance(edges, np.ndarray):
+            vs, ws = graph_io.vertex_columns(edges, n)
+            sources = np.stack((vs, ws), axis=1).ravel()
+            targets = np.stack((ws, vs), axis=1).ravel()
+        else:
+            vs, ws = graph_io.edge_columns(edges, 2)
+            sources = [None] * (2 * len(vs))
+            sources[0::2], sources[1::2] = vs, ws
+            targets = [None] * (2 * len(vs))
+            targets[0::2], targets[1::2] = ws, vs
+
+        return cls(CSR.from_pairs(n, sources, targets), len(sources) // 2)
+
+    def adjacent_vertices(self, v):
+        return self.adj[v]
+
+    def adjacent(self, v, w):
+        return w in self.adj[v]
 
-        return False
+    def reverse(self):
+        return self
 
 class DFS:
-    def __init__(self, g, s):
+    def __init__(self, g, s, tracer=None):
         self.marked = [False for _ in range(g.V)]
         self.count = 0
+        self.tracer = tracer
         self.dfs(g, s)
 
     def dfs(self, g, v):
-        self.marked[v] = True
-        self.count += 1
-        for w in g.adj[v]:
-            if not self.marked[w]:
-                self.dfs(g, w)
+        depth_first(g, v, self.marked, tracer=self.tracer)
+        self.count = sum(self.marked)
 
 class FindPathDFS:
-    def __init__(self, g, s):
+    def __init__(self, g, s, tracer=None):
         self.source = s
         self.marked = [False for _ in range(g.V)]
         self.edge_to = [-1 for _ in range(g.V)]
         self.count = 0
+        self.tracer = tracer
         self.dfs(g, s)
 
     def dfs(self, g, v):
-        self.marked[v] = True
-        self.count += 1
-        
-        for w in g.adj[v]:
-            if not self.marked[w]:
-                self.edge_to[w] = v
-                self.dfs(g, w)
+        depth_first(g, v, self.marked, self.edge_to, tracer=self.tracer)
+        self.count = sum(self.marked)
 
     def has_path_to(self, v):
         return self.marked[v]
@@ -75,24 +253,21 @@ class FindPathDFS:
 
 
 class FindPathBFS:
-    def __init__(self, g, s):
+    def __init__(self, g, s, tracer=None):
         self.marked = [False for _ in range(g.V)]
         self.edge_to = [-1 for _ in range(g.V)]
+        self.dist = [-1 for _ in range(g.V)]
         self.source = s
+        self.tracer = tracer
         self.bfs(g)
 
     def bfs(self, g):
-        self.marked[self.source] = True
-        to_visit = [self.source]
-
-        while to_visit:
-            curr = to_visit.pop(0)
+        breadth_first(g, [self.source], self.marked, self.edge_to, self.dist,
+                      g.reverse, self.tracer)
 
-            for w in g.adj[curr]:
-                if not self.marked[w]:
-                    to_visit.append(w)
-                    self.marked[w] = True
-                    self.edge_to[w] = curr
+    def dist_to(self, v):
+        '''number of edges on a shortest path to v, -1 if there is none'''
+        return self.dist[v]
 
     def shortest_path_to(self, v):
         path = [v]
@@ -106,57 +281,87 @@ class FindPathBFS:
         return path
 
 
+class BidirectionalPathBFS:
+    '''Shortest path between a single pair of vertices, found by searching
+    from both ends at once; only visits the vertices near s and t.'''
+    def __init__(self, g, s, t, tracer=None):
+        self.source, self.target = s, t
+        self.path, self.count = bidirectional_bfs(g, g, s, t, tracer)
+
+    def has_path(self):
+        return self.path is not None
+
+    def dist(self):
+        '''number of edges on a shortest path, -1 if there is none'''
+        return len(self.path) - 1 if self.path is not None else -1
+
+    def shortest_path(self):
+        return self.path
+
+
 class ConnectedComponents:
-    def __init__(self, g):
+    def __init__(self, g, tracer=None):
+        self.marked = [False for _ in range(g.V)]
         self.id = [-1 for _ in range(g.V)]
         self.count = 0
+        self.tracer = tracer
 
         for s in range(g.V):
             if self.id[s] == -1:
                 self.dfs(g, s)
                 self.count += 1
 
-        print(self.count)
+    def dfs(self, g, v):
+        depth_first(g, v, self.marked, pre=self.visit, tracer=self.tracer)
 
-    def dfs(self, g, v, indent=0):
+    def visit(self, v):
         self.id[v] = self.count
-        
-        for w in g.adj[v]:
-            if self.id[w] == -1:
-                self.dfs(g, w)
-            
+
     def connected(self, v, w):
         '''Checks if v and w are connected.'''
         return self.id[v] == self.id[w]
 
 
+class IncrementalConnectedComponents(WeightedQuickUnion):
+    '''Connected components of a graph on n vertices that only gains edges.
+    Each add_edge merges two components in a union-find instead of
+    recomputing the components of the whole graph.'''
+    def __init__(self, n, tracer=None):
+        super().__init__(n)
+        self.tracer = tracer
+
+    def add_edge(self, v, w):
+        if self.union(v, w) and self.tracer is not None:
+            self.tracer.union_performed(v, w)
+
+    def add_edges(self, vs, ws):
+        for v, w in zip(vs, ws):
+            self.add_edge(v, w)
+
+    def component_id(self, v):
+        '''a vertex of v's component that identifies it until the next merge'''
+        return self.find(v)
+
+
 class Cycle:
-    def __init__(self, g):
+    def __init__(self, g, tracer=None):
         self.marked = [False for _ in range(g.V)]
         self.edge_to = [-1 for _ in range(g.V)]
         self.cycle_start = -1
+        self.tracer = tracer
 
         for s in range(g.V):
             if not self.marked[s]:
-                self.dfs(g, s, s)
-
-    def dfs(self, g, u, v, indent=0):
-        self.marked[v] = True
-
-        print(indent * ' ' + 'visited', v)
-
-        for w in g.adj[v]:
-            print((indent + 2) * ' ' + 'checking', w)
+                self.dfs(g, s)
 
-            if not self.marked[w]:
-                self.edge_to[w] = v
-                self.dfs(g, v, w, indent+2)
-            elif w != u and self.cycle_start < 0:
-                print(indent * ' ' + 'found a cycle', file=sys.stderr)
-                self.cycle_start = w
-                self.edge_to[w] = v
+    def dfs(self, g, v):
+        depth_first(g, v, self.marked, self.edge_to, non_tree_edge=self.check,
+                    tracer=self.tracer)
 
-        print(indent * ' ' + 'done', v)
+    def check(self, v, w):
+        if w != self.edge_to[v] and self.cycle_start < 0:
+            self.cycle_start = w
+            self.edge_to[w] = v
 
     def has_cycle(self):
         return self.cycle_start >= 0
@@ -177,24 +382,27 @@ class Cycle:
 
 
 class Bipartite:
-    def __init__(self, g):
+    def __init__(self, g, tracer=None):
         self.marked = [False for _ in range(g.V)]
         self.colour = [0 for _ in range(g.V)]
         self.colourable = True
+        self.tracer = tracer
 
         for s in range(g.V):
             if not self.marked[s]:
-                self.dfs(g, s, 1)
+                self.colour[s] = 1
+                self.dfs(g, s)
+
+    def dfs(self, g, v):
+        depth_first(g, v, self.marked, tree_edge=self.tree_edge,
+                    non_tree_edge=self.check, tracer=self.tracer)
 
-    def dfs(self, g, v, c):
-        self.marked[v] = True
-        self.colour[v] = c
+    def tree_edge(self, v, w):
+        self.colour[w] = -self.colour[v]
 
-        for w in g.adj[v]:
-            if not self.marked[w]:
-                self.dfs(g, w, -c)
-            elif self.colour[w] == c:
-                self.colourable = False
+    def check(self, v, w):
+        if self.colour[w] == self.colour[v]:
+            self.colourable = False
 
 def colour_graph(g, c1, c2):
     tc = Bipartite(g)
@@ -0,0 +1,185 @@
+# graph_io.py
+
+import mmap
+import struct
+import sys
+from itertools import islice
+
+from csr import CSR
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# number of lines parsed at a time when reading an edge list
+CHUNK = 1 << 16
+
+# vertices are stored as int32 in a CSR
+MAX_VERTICES = 1 << 31
+
+def vertex_columns(edges, n=None):
+    '''Returns the first two columns of an (N, k) NumPy array of edges as
+    int64 arrays. Raises ValueError if a vertex is not a whole number, or
+    is negative, at least n or too large for a CSR.'''
+    limit = MAX_VERTICES if n is None else min(n, MAX_VERTICES)
+    columns = list()
+
+    for i in range(2):
+        column = edges[:, i]
+
+        if column.dtype.kind not in 'iu':
+            if not np.all(np.mod(column, 1) == 0):
+                raise ValueError('vertices must be whole numbers')
+
+        column = column.astype(np.int64)
+
+        if len(column) and (column.min() < 0 or column.max() >= limit):
+            raise ValueError(f'vertices must be in 0 to {limit - 1}')
+
+        columns.append(column)
+
+    return columns
+
+def edge_columns(edges, k, n=None):
+    '''splits edges, an iterable of k-tuples or an (N, k) NumPy array,
+    into k columns. The vertex columns of an array are checked by
+    vertex_columns and come back as ints, and the weight column as
+    floats.'''
+    if np is not None and isinstance(edges, np.ndarray):
+        columns = [column.tolist() for column in vertex_columns(edges, n)]
+
+        if k == 3:
+            columns.append(edges[:, 2].astype(np.float64).tolist())
+
+        return columns
+
+    columns = list(zip(*edges))
+
+    return columns if columns else [() for _ in range(k)]
+
+def read_edge_list(lines, weighted=False):
+    '''Reads an edge list in the tinyG/tinyEWG format from an iterable of
+    lines: the number of vertices, the number of edges, then one edge
+    "v w" (or "v w weight") per line.
+
+    Returns V and the columns of the edge list. Lines are parsed a chunk
+    at a time, so a stream is never held in memory as text.'''
+    lines = iter(lines)
+    header = list()
+
+    while len(header) < 2:
+        header.extend(next(lines).split())
+
+    V = int(header[0])
+    k = 3 if weighted else 2
+
+    vs, ws, weights = list(), list(), list()
+
+    for chunk in iter(lambda: list(islice(lines, CHUNK)), []):
+        tokens = ' '.join(chunk).split()
+
+        vs.extend(map(int, tokens[0::k]))
+        ws.extend(map(int, tokens[1::k]))
+
+        if weighted:
+            weights.extend(map(float, tokens[2::k]))
+
+    if weighted:
+        return V, [vs, ws, weights]
+    else:
+        return V, [vs, ws]
+
+
+# binary format: a fixed header followed by the offsets (int64), targets
+# (int32) and, for edge-weighted graphs, weights (float64) of a CSR, each
+# starting on an 8-byte boundary
+MAGIC = b'DSAG'
+VERSION = 1
+HEADER = struct.Struct('<4sHHIQQQ')
+KINDS = ('graph', 'digraph', 'edge_weighted_graph', 'edge_weighted_digraph')
+
+WEIGHTED = 1
+BIG_ENDIAN = 2
+
+def _padding(n):
+    return -n % 8
+
+def _sections(kind, m, csr):
+    flags = 0
+    if csr.weights is not None:
+        flags |= WEIGHTED
+    if sys.byteorder == 'big':
+        flags |= BIG_ENDIAN
+
+    if csr.offsets.itemsize != 8 or csr.targets.itemsize != 4:
+        raise ValueError('CSR must have int64 offsets and int32 targets')
+
+    yield HEADER.pack(MAGIC, VERSION, KINDS.index(kind), flags,
+                      len(csr), m, len(csr.targets))
+    yield bytes(_padding(HEADER.size))
+    yield csr.offsets
+    yield csr.targets
+
+    if csr.weights is not None:
+        yield bytes(_padding(csr.targets.nbytes))
+        yield csr.weights
+
+def binary_size(csr):
+    return sum(memoryview(section).nbytes for section in _sections('graph', 0, csr))
+
+def write_binary(path, kind, m, csr):
+    '''writes a CSR with m edges to path, tagged with the kind of graph'''
+    with open(path, 'wb') as f:
+        for section in _sections(kind, m, csr):
+            f.write(section)
+
+def pack_binary(buf, kind, m, csr):
+    '''writes a CSR with m edges into a writable buffer of binary_size(csr)
+    bytes, in the same layout as write_binary'''
+    buf = memoryview(buf).cast('B')
+    start = 0
+
+    for section in _sections(kind, m, csr):
+        section = memoryview(section).cast('B')
+        buf[start:start + section.nbytes] = section
+        start += section.nbytes
+
+def unpack_binary(buf, kind, source='buffer'):
+    '''Returns the number of edges and the offsets, targets and weights
+    (None if unweighted) stored in buf, as views of buf.'''
+    buf = memoryview(buf).cast('B')
+    magic, version, kind_index, flags, n, m, nnz = HEADER.unpack_from(buf)
+
+    if magic != MAGIC:
+        raise ValueError(f'{source} is not a graph file')
+    if version != VERSION:
+        raise ValueError(f'{source} has unsupported version {version}')
+    if KINDS[kind_index] != kind:
+        raise ValueError(f'{source} holds a {KINDS[kind_index]}, not a {kind}')
+    if bool(flags & BIG_ENDIAN) != (sys.byteorder == 'big'):
+        raise ValueError(f'{source} was written with a different byte order')
+
+    start = HEADER.size + _padding(HEADER.size)
+    offsets = buf[start:start + 8 * (n + 1)].cast('q')
+
+    start += 8 * (n + 1)
+    targets = buf[start:start + 4 * nnz].cast('i')
+
+    weights = None
+    if flags & WEIGHTED:
+        start += 4 * nnz + _padding(4 * nnz)
+        weights = buf[start:start + 8 * nnz].cast('d')
+
+    return m, (offsets, targets, weights)
+
+def read_binary(path, kind):
+    '''Memory-maps a file written by write_binary and returns its number of
+    edges and a CSR whose arrays are views of the mapped file, so nothing
+    is copied and processes loading the same file share its pages.'''
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    m, columns = unpack_binary(mapped, kind, path)
+
+    return m, CSR(*columns)
@@ -153,6 +153,107 @@ class MinPriorityQueue:
         return item
 
 
+class IndexMinPriorityQueue:
+    '''Min priority queue of keys associated with the integers 0 to n - 1,
+    which allows the key of an index already in the queue to be decreased.
+    The heap is kept in flat lists and sifted with loops: pq[k] is the index
+    at heap position k (from 1), qp[i] the position of index i (0 if not in
+    the queue), and keys[i] its key.'''
+    def __init__(self, n):
+        self.n = 0
+        self.pq = [0] * (n + 1)
+        self.qp = [0] * n
+        self.keys = [None] * n
+
+    def empty(self):
+        return self.n == 0
+
+    def __len__(self):
+        return self.n
+
+    def contains(self, i):
+        return self.qp[i] != 0
+
+    def key_of(self, i):
+        return self.keys[i]
+
+    def insert(self, i, key):
+        if self.contains(i):
+            raise ValueError(f'index {i} is already in the queue')
+
+        self.n += 1
+        self.keys[i] = key
+        self.pq[self.n] = i
+        self.qp[i] = self.n
+        self.swim(self.n)
+
+    def decrease_key(self, i, key):
+        if not self.contains(i):
+            raise ValueError(f'index {i} is not in the queue')
+        if not key < self.keys[i]:
+            raise ValueError('key is not less than the current key')
+
+        self.keys[i] = key
+        self.swim(self.qp[i])
+
+    def min_index(self):
+        return self.pq[1]
+
+    def min_key(self):
+        return self.keys[self.pq[1]]
+
+    def remove_min(self):
+        '''removes the minimum key and returns its index'''
+        if self.n == 0:
+            raise ValueError('remove_min from empty priority queue')
+
+        i = self.pq[1]
+        last = self.pq[self.n]
+        self.n -= 1
+
+        if self.n > 0:
+            self.pq[1] = last
+            self.qp[last] = 1
+            self.sink(1)
+
+        self.qp[i] = 0
+        self.keys[i] = None
+
+        return i
+
+    def swim(self, k):
+        pq, qp, keys = self.pq, self.qp, self.keys
+        i = pq[k]
+        key = keys[i]
+
+        while k > 1 and key < keys[pq[k // 2]]:
+            pq[k] = pq[k // 2]
+            qp[pq[k]] = k
+            k //= 2
+
+        pq[k] = i
+        qp[i] = k
+
+    def sink(self, k):
+        pq, qp, keys, n = self.pq, self.qp, self.keys, self.n
+        i = pq[k]
+        key = keys[i]
+
+        while 2 * k <= n:
+            j = 2 * k
+            if j < n and keys[pq[j + 1]] < keys[pq[j]]:
+                j += 1
+            if not keys[pq[j]] < key:
+                break
+
+            pq[k] = pq[j]
+            qp[pq[k]] = k
+            k = j
+
+        pq[k] = i
+        qp[i] = k
+
+
 def heapsort(t, key=None):
     if key:
         pq = PriorityQueue(compare_to = lambda x, y: key(x) > key(y))
@@ -0,0 +1,90 @@
+# shared_graph.py
+
+from multiprocessing import shared_memory
+
+import graph_io
+from csr import CSR
+
+class SharedCSR(CSR):
+    '''CSR whose arrays are read-only views of a shared memory block, laid
+    out as in graph_io's binary format. Pickling it sends only the name of
+    the block and unpickling attaches to the block, so process pool workers
+    all read the same pages instead of receiving copies of the graph.'''
+    def __init__(self, shm, kind):
+        m, columns = graph_io.unpack_binary(shm.buf.toreadonly(), kind, shm.name)
+        super().__init__(*columns)
+        self.shm, self.kind, self.m = shm, kind, m
+
+    @classmethod
+    def publish(cls, kind, m, csr):
+        '''copies a CSR with m edges into a new shared memory block'''
+        shm = shared_memory.SharedMemory(create=True, size=graph_io.binary_size(csr))
+        graph_io.pack_binary(shm.buf, kind, m, csr)
+        return cls(shm, kind)
+
+    def __reduce__(self):
+        return (attach, (self.shm.name, self.kind))
+
+    def close(self):
+        '''detaches this process from the block'''
+        for column in (self.offsets, self.targets, self.weights):
+            if column is not None:
+                column.release()
+
+        self.shm.close()
+
+    def unlink(self):
+        '''frees the block once every process has closed it; called once,
+        by the process that published the graph'''
+        self.close()
+        self.shm.unlink()
+
+
+def attach(name, kind):
+    try:
+        # keep the resource tracker of a worker from freeing the block
+        shm = shared_memory.SharedMemory(name, track=False)
+    except TypeError:
+        shm = shared_memory.SharedMemory(name)
+
+    return SharedCSR(shm, kind)
+
+
+class FrozenStorage:
+    '''load, save and share for a frozen graph class, which is built as
+    cls(csr, m) from a CSR and its number of edges. Subclasses give their
+    graph_io kind in kind and return the CSR and m from parts().'''
+    kind = None
+
+    def parts(self):
+        raise NotImplementedError
+
+    @classmethod
+    def load(cls, path):
+        '''memory-maps a graph written by save'''
+        m, csr = graph_io.read_binary(path, cls.kind)
+        return cls(csr, m)
+
+    def save(self, path):
+        '''writes the graph to path in the binary format of graph_io'''
+        csr, m = self.parts()
+        graph_io.write_binary(path, self.kind, m, csr)
+
+    def share(self):
+        '''Returns a copy of the graph in shared memory. The copy can be
+        passed to worker processes, which attach to the same memory rather
+        than unpickling a copy. Free it with unlink() on its CSR when done.'''
+        csr, m = self.parts()
+        return type(self)(SharedCSR.publish(self.kind, m, csr), m)
+
+
+class FreezableStorage:
+    '''save and share for a graph class whose freeze() returns a frozen
+    copy, which does the work'''
+    def save(self, path):
+        '''writes the graph to path in the binary format of graph_io'''
+        self.freeze().save(path)
+
+    def share(self):
+        '''returns a read-only copy of the graph in shared memory'''
+        return self.freeze().share()
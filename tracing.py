@@ -0,0 +1,81 @@
+# tracing.py
+
+import json
+import sys
+
+class Tracer:
+    '''Receives events from the algorithms it is passed to. Algorithms only
+    call a tracer when one is given, so tracing costs nothing otherwise.
+    Every event is ignored here; subclasses override the ones they want.'''
+    def vertex_visited(self, v):
+        pass
+
+    def edge_examined(self, v, w):
+        pass
+
+    def edge_relaxed(self, e):
+        pass
+
+    def edge_accepted(self, e):
+        pass
+
+    def edge_rejected(self, e):
+        pass
+
+    def union_performed(self, p, q):
+        pass
+
+
+class CountingTracer(Tracer):
+    '''counts the events of each kind'''
+    def __init__(self):
+        self.counts = dict.fromkeys(EVENTS, 0)
+
+    def vertex_visited(self, v):
+        self.counts['vertex_visited'] += 1
+
+    def edge_examined(self, v, w):
+        self.counts['edge_examined'] += 1
+
+    def edge_relaxed(self, e):
+        self.counts['edge_relaxed'] += 1
+
+    def edge_accepted(self, e):
+        self.counts['edge_accepted'] += 1
+
+    def edge_rejected(self, e):
+        self.counts['edge_rejected'] += 1
+
+    def union_performed(self, p, q):
+        self.counts['union_performed'] += 1
+
+
+class LogTracer(Tracer):
+    '''writes each event to a file as one line of JSON'''
+    def __init__(self, file=sys.stderr):
+        self.file = file
+
+    def log(self, event, **fields):
+        print(json.dumps({'event': event, **fields}), file=self.file)
+
+    def vertex_visited(self, v):
+        self.log('vertex_visited', v=v)
+
+    def edge_examined(self, v, w):
+        self.log('edge_examined', v=v, w=w)
+
+    def edge_relaxed(self, e):
+        self.log('edge_relaxed', edge=str(e))
+
+    def edge_accepted(self, e):
+        self.log('edge_accepted', edge=str(e))
+
+    def edge_rejected(self, e):
+        self.log('edge_rejected', edge=str(e))
+
+    def union_performed(self, p, q):
+        self.log('union_performed', p=p, q=q)
+
+
+EVENTS = ('vertex_visited', 'edge_examined', 'edge_relaxed',
+          'edge_accepted', 'edge_rejected', 'union_performed')
@@ -0,0 +1,221 @@
+# traversal.py
+
+def depth_first(g, s, marked, edge_to=None, pre=None, post=None,
+                tree_edge=None, non_tree_edge=None, tracer=None):
+    '''Depth-first search from s using an explicit stack, so path length
+    is not limited by the recursion limit.
+
+    Marks every vertex reached in marked. If edge_to is given, edge_to[w]
+    is set to the vertex w was reached from. pre(v) and post(v) are called
+    when v is entered and finished, tree_edge(v, w) when w is reached from
+    v, and non_tree_edge(v, w) when v has an edge to an already marked w.
+    Vertices and edges are visited in the same order as the recursive
+    version. If a tracer is given it is told of each vertex visited and
+    edge examined.'''
+    adj = g.adj
+
+    marked[s] = True
+    if tracer is not None:
+        tracer.vertex_visited(s)
+    if pre is not None:
+        pre(s)
+
+    # the stack holds plain ints (a vertex and the position of its next
+    # neighbour) so it adds no work for the garbage collector
+    stack, index = [s], [0]
+
+    while stack:
+        v = stack[-1]
+        neighbours = adj[v]
+        i, n = index[-1], len(neighbours)
+
+        while i < n:
+            w = neighbours[i]
+            i += 1
+
+            if tracer is not None:
+                tracer.edge_examined(v, w)
+
+            if not marked[w]:
+                index[-1] = i
+                marked[w] = True
+
+                if tracer is not None:
+                    tracer.vertex_visited(w)
+
+                if edge_to is not None:
+                    edge_to[w] = v
+                if tree_edge is not None:
+                    tree_edge(v, w)
+                if pre is not None:
+                    pre(w)
+
+                stack.append(w)
+                index.append(0)
+                break
+            elif non_tree_edge is not None:
+                non_tree_edge(v, w)
+        else:
+            stack.pop()
+            index.pop()
+
+            if post is not None:
+                post(v)
+
+
+# direction-optimising BFS switches to bottom-up steps when the edges out
+# of the frontier exceed 1/ALPHA of the edges out of unvisited vertices,
+# and back to top-down steps when the frontier drops below 1/BETA of V
+ALPHA = 14
+BETA = 24
+
+def breadth_first(g, sources, marked, edge_to, dist, reverse=None,
+                  tracer=None):
+    '''Level-synchronous breadth-first search from every vertex in sources.
+
+    Marks every vertex reached in marked, and sets edge_to[w] to the
+    vertex w was reached from and dist[w] to the number of edges on a
+    shortest path to w. Each level is expanded as a whole. If reverse is
+    given it should return g with its edges reversed; it is called at
+    most once, the first time a level is large enough for a bottom-up
+    step (each unvisited vertex looks for a parent in the frontier) to
+    examine fewer edges than a top-down one. If a tracer is given it is
+    told of each vertex visited and edge examined.'''
+    adj, pred = g.adj, None
+
+    frontier = list()
+    for s in sources:
+        if not marked[s]:
+            marked[s] = True
+            dist[s] = 0
+            frontier.append(s)
+
+            if tracer is not None:
+                tracer.vertex_visited(s)
+
+    # edges out of the frontier and out of unvisited vertices
+    frontier_edges = sum(len(adj[v]) for v in frontier)
+    unvisited_edges = sum(map(len, adj)) - frontier_edges
+
+    level, bottom_up = 0, False
+
+    while frontier:
+        if bottom_up:
+            bottom_up = len(frontier) >= g.V / BETA
+        elif reverse is not None:
+            bottom_up = frontier_edges > unvisited_edges / ALPHA
+
+        level += 1
+        next_frontier = list()
+
+        if bottom_up:
+            if pred is None:
+                pred = reverse().adj
+
+            for w in range(g.V):
+                if not marked[w]:
+                    for v in pred[w]:
+                        if tracer is not None:
+                            tracer.edge_examined(v, w)
+
+                        if dist[v] == level - 1:
+                            marked[w] = True
+                            edge_to[w] = v
+                            dist[w] = level
+                            next_frontier.append(w)
+
+                            if tracer is not None:
+                                tracer.vertex_visited(w)
+                            break
+        else:
+            for v in frontier:
+                for w in adj[v]:
+                    if tracer is not None:
+                        tracer.edge_examined(v, w)
+
+                    if not marked[w]:
+                        marked[w] = True
+                        edge_to[w] = v
+                        dist[w] = level
+                        next_frontier.append(w)
+
+                        if tracer is not None:
+                            tracer.vertex_visited(w)
+
+        frontier = next_frontier
+        frontier_edges = sum(len(adj[v]) for v in frontier)
+        unvisited_edges -= frontier_edges
+
+def bidirectional_bfs(g, rev, s, t, tracer=None):
+    '''Shortest path from s to t, found by breadth-first searches forward
+    from s over g and backward from t over rev (g with its edges reversed).
+    The side with the smaller frontier is expanded a level at a time, and
+    the search stops at the end of the first level on which the two sides
+    meet, so only vertices near s and t are visited.
+
+    Returns the path as a list of vertices (None if t is unreachable) and
+    the number of vertices visited.'''
+    if tracer is not None:
+        tracer.vertex_visited(s)
+        if t != s:
+            tracer.vertex_visited(t)
+
+    if s == t:
+        return [s], 1
+
+    # parent and distance of each vertex visited by each side
+    forward, backward = {s: (s, 0)}, {t: (t, 0)}
+    forward_frontier, backward_frontier = [s], [t]
+
+    while forward_frontier and backward_frontier:
+        if len(forward_frontier) <= len(backward_frontier):
+            forward_frontier, meet = _expand_level(g.adj, forward_frontier,
+                                                   forward, backward, tracer)
+        else:
+            backward_frontier, meet = _expand_level(rev.adj, backward_frontier,
+                                                    backward, forward, tracer)
+
+        if meet is not None:
+            path = [meet]
+
+            v = meet
+            while v != s:
+                v = forward[v][0]
+                path.append(v)
+
+            path.reverse()
+
+            v = meet
+            while v != t:
+                v = backward[v][0]
+                path.append(v)
+
+            return path, len(forward) + len(backward)
+
+    return None, len(forward) + len(backward)
+
+def _expand_level(adj, frontier, visited, other, tracer):
+    '''Visits the next level of one side of a bidirectional search. Returns
+    the new frontier and the vertex seen by both sides on the shortest path
+    through this level, or None.'''
+    next_frontier = list()
+    meet, best = None, -1
+
+    for v in frontier:
+        d = visited[v][1] + 1
+
+        for w in adj[v]:
+            if tracer is not None:
+                tracer.edge_examined(v, w)
+
+            if w not in visited:
+                visited[w] = (v, d)
+                next_frontier.append(w)
+
+                if tracer is not None:
+                    tracer.vertex_visited(w)
+
+                if w in other and (meet is None or d + other[w][1] < best):
+                    meet, best = w, d + other[w][1]
+
+    return next_frontier, meet
@@ -41,6 +41,41 @@ class QuickUnion(UnionFind):
             self.roots[p_root] = q_root
             self.count -= 1
 
+class WeightedQuickUnion(UnionFind):
+    '''Links the root of the smaller tree to the root of the larger, and
+    halves paths as it finds roots, so operations take near-constant
+    amortised time. find is iterative, so deep trees cannot overflow the
+    stack.'''
+    def __init__(self, n):
+        super().__init__(n)
+        self.size = [1 for _ in range(n)]
+
+    def find(self, p):
+        roots = self.roots
+
+        while roots[p] != p:
+            roots[p] = roots[roots[p]]
+            p = roots[p]
+
+        return p
+
+    def union(self, p, q):
+        '''merges the components of p and q; returns False if they were
+        already the same component'''
+        p_root, q_root = self.find(p), self.find(q)
+
+        if p_root == q_root:
+            return False
+
+        if self.size[p_root] < self.size[q_root]:
+            p_root, q_root = q_root, p_root
+
+        self.roots[q_root] = p_root
+        self.size[p_root] += self.size[q_root]
+        self.count -= 1
+
+        return True
+
 if __name__ == '__main__':
     pairs = [
         (4,3), (3,8), (6,5), (9,4), (2,1), (8,9),